@@ -41,7 +41,8 @@ class EVRefreshButton(CoordinatorEntity, ButtonEntity):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self.coordinator.async_refresh()
+        # Debounced, so repeated presses coalesce into a single refresh
+        await self.coordinator.async_request_refresh()
 
 
 class EVClearOverrideButton(CoordinatorEntity, ButtonEntity):
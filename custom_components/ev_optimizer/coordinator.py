@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import math
+import os
+from dataclasses import dataclass
 from datetime import timedelta, datetime, time
 
 from homeassistant.config_entries import ConfigEntry
@@ -91,7 +94,7 @@ from .const import (
 # Imports for Real-time Safety safety
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.core import callback
-from time import perf_counter
+from time import monotonic, perf_counter
 
 # Imports from helper modules
 from .image_generator import generate_report_image, generate_plan_image
@@ -101,6 +104,121 @@ from .snapshot_manager import SnapshotManager
 
 _LOGGER = logging.getLogger(__name__)
 
+# Polling cadence. Keep the tight interval whenever a car is plugged in, since
+# charging slots are 15 minutes long and load balancing must stay responsive.
+# While unplugged nothing can be actuated, and plug-in is picked up by a state
+# listener on the plugged sensor, so polling can back off.
+UPDATE_INTERVAL_PLUGGED = timedelta(seconds=30)
+UPDATE_INTERVAL_UNPLUGGED = timedelta(minutes=5)
+
+# No charger commands are sent during the first seconds after startup
+STARTUP_GRACE_SECONDS = 120
+
+# How long fetched calendar events are reused before asking the calendar again.
+# The planner ignores events that already started, so slightly stale data is safe.
+CALENDAR_CACHE_TTL = timedelta(minutes=10)
+
+# Setting changes within this many seconds share one refresh
+SETTINGS_REFRESH_DELAY = 1.0
+
+# Fields of the update data drawn by generate_plan_image
+_PLAN_IMAGE_KEYS = (
+    "charging_schedule",
+    "departure_time",
+    "charging_summary",
+    "car_soc",
+    "planned_target_soc",
+)
+
+# Normalized plugged sensor states; anything else is parsed as a number
+_PLUGGED_TRUE_STATES = frozenset(
+    {"on", "true", "connected", "charging", "full", "plugged_in", "plugged", "yes", "y", "1"}
+)
+_PLUGGED_FALSE_STATES = frozenset(
+    {
+        "off",
+        "false",
+        "disconnected",
+        "unplugged",
+        "no",
+        "n",
+        "0",
+        STATE_UNKNOWN,
+        STATE_UNAVAILABLE,
+    }
+)
+
+# Fixed car refresh intervals (REFRESH_AT_TARGET is handled separately)
+REFRESH_INTERVALS = {
+    REFRESH_30_MIN: timedelta(minutes=30),
+    REFRESH_1_HOUR: timedelta(hours=1),
+    REFRESH_2_HOURS: timedelta(hours=2),
+    REFRESH_3_HOURS: timedelta(hours=3),
+    REFRESH_4_HOURS: timedelta(hours=4),
+}
+
+# User settings reported by dump_debug_state, with the defaults shown when unset
+_DEBUG_USER_SETTING_DEFAULTS = (
+    (ENTITY_TARGET_SOC, 80),
+    (ENTITY_MIN_SOC, 20),
+    (ENTITY_DEPARTURE_TIME, time(7, 0)),
+    (ENTITY_DEPARTURE_OVERRIDE, time(7, 0)),
+    (ENTITY_SMART_SWITCH, True),
+    (ENTITY_TARGET_OVERRIDE, 80),
+    (ENTITY_PRICE_LIMIT_1, 0.5),
+    (ENTITY_TARGET_SOC_1, 100),
+    (ENTITY_PRICE_LIMIT_2, 1.5),
+    (ENTITY_TARGET_SOC_2, 80),
+    (ENTITY_PRICE_EXTRA_FEE, 0.0),
+    (ENTITY_PRICE_VAT, 0.0),
+)
+
+
+@dataclass(slots=True)
+class ChargerState:
+    """Last commands sent to the charger and car, used to skip repeated calls."""
+
+    applied_amps: int = -1
+    applied_state: str | None = None  # "charging", "maintenance" or "paused"
+    applied_car_limit: int = -1
+    # (state, amps, car limit) of the last fully successful control pass
+    applied_control: tuple | None = None
+
+    def reset(self) -> None:
+        """Forget everything sent so the next pass re-applies the full state."""
+        self.applied_amps = -1
+        self.applied_state = None
+        self.applied_car_limit = -1
+        self.applied_control = None
+
+
+def _state_float(states, entity_id: str | None, cache: dict | None = None) -> float:
+    """Return an entity's state as float, 0.0 if missing, unavailable or not numeric.
+
+    When a cache dict is given, the parsed value is remembered per entity together
+    with the state's last_updated, and reused until the entity gets a new state.
+    """
+    if not entity_id:
+        return 0.0
+    state = states.get(entity_id)
+    if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return 0.0
+
+    last_updated = getattr(state, "last_updated", None) if cache is not None else None
+    if last_updated is not None:
+        cached = cache.get(entity_id)
+        if cached is not None and cached[0] == last_updated:
+            return cached[1]
+
+    try:
+        value = float(state.state)
+    except ValueError:
+        value = 0.0
+
+    if last_updated is not None:
+        cache[entity_id] = (last_updated, value)
+    return value
+
 
 class EVSmartChargerCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API and calculating charging logic."""
@@ -110,8 +228,9 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         self.entry = entry
         self.hass = hass
 
-        # Track startup time for grace period
-        self._startup_time = datetime.now()
+        # Track startup time for grace period. Elapsed-time bookkeeping uses the
+        # monotonic clock so DST changes or clock syncs can't distort intervals.
+        self._startup_monotonic = monotonic()
 
         # Internal state
         self.previous_plugged_state = False
@@ -132,18 +251,16 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         self._last_scheduled_end = None  # Track end of planned charging for buffer
 
         # Refresh Logic
-        self._last_car_refresh_time = None
+        self._last_car_refresh_monotonic: float | None = None
         self._refresh_trigger_timestamp = None
         self._soc_before_refresh = None
 
         # State tracking to prevent API spamming
-        self._last_applied_amps = -1
-        self._last_applied_state = None  # "charging" or "paused"
-        self._last_applied_car_limit = -1
+        self._charger_state = ChargerState()
 
         # Virtual SoC Estimator
         self._virtual_soc = 0.0
-        self._last_update_time = datetime.now()
+        self._last_update_monotonic = monotonic()
         self._last_sensor_soc = None  # Track last raw sensor value to detect real updates
 
         # Locked Plan: Lock plan once charging starts to prevent recalculation with stale SoC
@@ -160,21 +277,29 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         self._safety_listeners = []
         self._debounce_unsub = None
         self._last_p1_update = datetime.min
+        self._settings_refresh_unsub = None
 
         # Overload prevention tracking
         self._last_overload_check_time = None
 
+        # Calendar events cache: (expires_at, events)
+        self._calendar_cache: tuple[datetime, list] = (datetime.min, [])
+
         # Automatic image generation tracking
         self._last_plan_image_signature = None
         self._last_report_generated = False
+        # File name -> content hash of the last render written to it
+        self._rendered_image_keys: dict[str, int] = {}
+
+        # Adaptive polling: restored to this whenever the car is plugged in
+        self._base_update_interval = UPDATE_INTERVAL_PLUGGED
 
         # Persistence
         self.store = Store(hass, 1, f"{DOMAIN}.{entry.entry_id}")
         self._data_loaded = False
 
-        # Helper to get config from Options (new) or Data (initial)
-        def get_conf(key, default=None):
-            return entry.options.get(key, entry.data.get(key, default))
+        # Config from Options (new) over Data (initial), merged once
+        cfg = {**entry.data, **entry.options}
 
         # Initialize user_settings with default values
         # These will be overwritten by persisted values in _load_data if they exist
@@ -187,22 +312,26 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         self.user_settings[ENTITY_PRICE_LIMIT_2] = DEFAULT_PRICE_LIMIT_2
         self.user_settings[ENTITY_TARGET_SOC_2] = DEFAULT_TARGET_SOC_2
 
+        # Config floats are validated and cast here once, never at read sites.
+        # The loss is read options-first like the rest of the config and
+        # defaults to DEFAULT_LOSS (0%, learned later) when not configured.
+        self._charger_loss_pct = float(cfg.get(CONF_CHARGER_LOSS, DEFAULT_LOSS))
+
         # Config Variables passed to planner
         self.config_settings = {
-            "max_fuse": float(get_conf(CONF_MAX_FUSE)),
-            "charger_loss": float(get_conf(CONF_CHARGER_LOSS)),
-            "car_capacity": float(get_conf(CONF_CAR_CAPACITY)),
-            "currency": get_conf(CONF_CURRENCY, DEFAULT_CURRENCY),
-            "has_price_sensor": bool(get_conf(CONF_PRICE_SENSOR)),
+            "max_fuse": float(cfg.get(CONF_MAX_FUSE)),
+            "charger_loss": self._charger_loss_pct,
+            "car_capacity": float(cfg.get(CONF_CAR_CAPACITY)),
+            "currency": cfg.get(CONF_CURRENCY, DEFAULT_CURRENCY),
+            "has_price_sensor": bool(cfg.get(CONF_PRICE_SENSOR)),
         }
 
         self.car_capacity = self.config_settings["car_capacity"]
         self.currency = self.config_settings["currency"]
 
         # Initialize learning state with config defaults
-        configured_loss = float(get_conf(CONF_CHARGER_LOSS, DEFAULT_LOSS))
         self.learning_state = {
-            LEARNING_CHARGER_LOSS: configured_loss,
+            LEARNING_CHARGER_LOSS: self._charger_loss_pct,
             LEARNING_CONFIDENCE: 0,
             LEARNING_SESSIONS: 0,
             LEARNING_LOCKED: False,
@@ -210,40 +339,54 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             LEARNING_LAST_REFRESH: None,
             LEARNING_PRICE_ARRIVAL: [],  # Track when tomorrow's prices arrive
         }
+
+        # Energy delivered to the battery per amp-hour on 3x230V, after charger loss
+        self._kw_per_amp_eff = (3 * 230 / 1000.0) * (1.0 - self._charger_loss_pct / 100.0)
         
         # Track when we last saw tomorrow's prices
         self._last_tomorrow_valid = False
 
         # Key Mappings
         self.conf_keys = {
-            "p1_l1": get_conf(CONF_P1_L1),
-            "p1_l2": get_conf(CONF_P1_L2),
-            "p1_l3": get_conf(CONF_P1_L3),
-            "car_soc": get_conf(CONF_CAR_SOC_SENSOR),
-            "car_plugged": get_conf(CONF_CAR_PLUGGED_SENSOR),
-            "car_limit": get_conf(CONF_CAR_CHARGING_LEVEL_ENTITY),
-            "car_svc": get_conf(CONF_CAR_LIMIT_SERVICE),
-            "car_target_ent": get_conf(
+            "p1_l1": cfg.get(CONF_P1_L1),
+            "p1_l2": cfg.get(CONF_P1_L2),
+            "p1_l3": cfg.get(CONF_P1_L3),
+            "car_soc": cfg.get(CONF_CAR_SOC_SENSOR),
+            "car_plugged": cfg.get(CONF_CAR_PLUGGED_SENSOR),
+            "car_limit": cfg.get(CONF_CAR_CHARGING_LEVEL_ENTITY),
+            "car_svc": cfg.get(CONF_CAR_LIMIT_SERVICE),
+            "car_target_ent": cfg.get(
                 CONF_CAR_ENTITY_ID
             ),  # Shared Entity for Limit AND Refresh
-            "price": get_conf(CONF_PRICE_SENSOR),
-            "calendar": get_conf(CONF_CALENDAR_ENTITY),
-            "zap_limit": get_conf(CONF_ZAPTEC_LIMITER),
-            "zap_switch": get_conf(CONF_ZAPTEC_SWITCH),
-            "zap_resume": get_conf(CONF_ZAPTEC_RESUME),
-            "zap_stop": get_conf(CONF_ZAPTEC_STOP),
-            "ch_l1": get_conf(CONF_CHARGER_CURRENT_L1),
-            "ch_l2": get_conf(CONF_CHARGER_CURRENT_L2),
-            "ch_l3": get_conf(CONF_CHARGER_CURRENT_L3),
-            "refresh_svc": get_conf(CONF_CAR_REFRESH_ACTION),
-            "refresh_int": get_conf(CONF_CAR_REFRESH_INTERVAL),
+            "price": cfg.get(CONF_PRICE_SENSOR),
+            "calendar": cfg.get(CONF_CALENDAR_ENTITY),
+            "zap_limit": cfg.get(CONF_ZAPTEC_LIMITER),
+            "zap_switch": cfg.get(CONF_ZAPTEC_SWITCH),
+            "zap_resume": cfg.get(CONF_ZAPTEC_RESUME),
+            "zap_stop": cfg.get(CONF_ZAPTEC_STOP),
+            "ch_l1": cfg.get(CONF_CHARGER_CURRENT_L1),
+            "ch_l2": cfg.get(CONF_CHARGER_CURRENT_L2),
+            "ch_l3": cfg.get(CONF_CHARGER_CURRENT_L3),
+            "refresh_svc": cfg.get(CONF_CAR_REFRESH_ACTION),
+            "refresh_int": cfg.get(CONF_CAR_REFRESH_INTERVAL),
         }
 
+        # (data key, entity id) pairs read as floats on every update
+        self._float_entities = tuple(
+            (key, self.conf_keys[key])
+            for key in ("p1_l1", "p1_l2", "p1_l3", "car_soc", "ch_l1", "ch_l2", "ch_l3")
+        ) + (
+            # Zaptec limiter value, used as load balancing fallback
+            ("zap_limit_value", self.conf_keys["zap_limit"]),
+        )
+        # entity id -> (last_updated, parsed float)
+        self._state_float_cache: dict[str, tuple[datetime, float]] = {}
+
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=30),
+            update_interval=self._base_update_interval,
         )
 
     def async_setup_listeners(self):
@@ -258,13 +401,22 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         p1_sensors = [s for s in p1_sensors if s]
 
         if p1_sensors:
-            _LOGGER.debug(f"Setting up real-time safety listeners for: {p1_sensors}")
+            _LOGGER.debug("Setting up real-time safety listeners for: %s", p1_sensors)
             self._safety_listeners.append(
                 async_track_state_change_event(
                     self.hass, p1_sensors, self._async_p1_update_callback
                 )
             )
 
+        # Refresh immediately on plug/unplug, polling is relaxed while unplugged
+        plugged_sensor = self.conf_keys["car_plugged"]
+        if plugged_sensor:
+            self._safety_listeners.append(
+                async_track_state_change_event(
+                    self.hass, [plugged_sensor], self._async_plugged_update_callback
+                )
+            )
+
     def async_shutdown(self):
         """Cancel listeners and timers to clean up."""
         for unsub in self._safety_listeners:
@@ -275,9 +427,18 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             self._debounce_unsub()
             self._debounce_unsub = None
 
+        if self._settings_refresh_unsub:
+            self._settings_refresh_unsub.cancel()
+            self._settings_refresh_unsub = None
+
     @callback
     def _async_p1_update_callback(self, event):
         """Handle P1 meter state changes with debouncing."""
+        # Load balancing only matters while the car is plugged in; the plugged
+        # listener refreshes immediately on plug-in, so unplugged P1 noise is ignored
+        if not self.previous_plugged_state:
+            return
+
         now = datetime.now()
         
         # Debounce: Ensure we don't update more than once every 2 seconds
@@ -296,6 +457,11 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         # If enough time passed, update immediately
         self._async_scheduled_refresh()
 
+    @callback
+    def _async_plugged_update_callback(self, event):
+        """Handle plugged sensor changes by requesting a refresh."""
+        self.hass.async_create_task(self.async_request_refresh())
+
     @callback
     def _async_scheduled_refresh(self):
         """Trigger the actual refresh."""
@@ -304,9 +470,9 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         # Request refresh (schedule it since we can't await in a callback)
         self.hass.async_create_task(self.async_request_refresh())
 
-    def _add_log(self, message: str):
+    def _add_log(self, message: str, now: datetime | None = None):
         """Add an entry to the action log."""
-        self.session_manager.add_log(message)
+        self.session_manager.add_log(message, now)
         # Also track for this update's snapshot
         self._actions_this_update.append(message)
 
@@ -349,14 +515,15 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                                 settings[key] = time(int(parts[0]), int(parts[1]))
                         except Exception:
                             _LOGGER.warning(
-                                f"Failed to parse saved time for {key}, resetting to default."
+                                "Failed to parse saved time for %s, resetting to default.",
+                                key,
                             )
                             settings.pop(key, None)
 
                 self.user_settings.update(settings)
                 self._add_log("System started. Settings and Log loaded.")
         except Exception as e:
-            _LOGGER.error(f"Failed to load EV settings: {e}")
+            _LOGGER.error("Failed to load EV settings: %s", e)
 
         self._data_loaded = True
 
@@ -388,9 +555,20 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
 
     def set_user_input(self, key: str, value, internal: bool = False):
         """Update a user setting from the UI."""
-        _LOGGER.debug(f"Setting user input: {key} = {value} (type: {type(value)})")
+        if self.user_settings.get(key) == value and (
+            internal or key != ENTITY_TARGET_OVERRIDE or self.manual_override_active
+        ):
+            # Nothing to persist or replan. Re-selecting the current Next Session
+            # target still has to activate manual override, so that case falls through.
+            return
+
+        _LOGGER.debug("Setting user input: %s = %s (type: %s)", key, value, type(value))
         self.user_settings[key] = value
 
+        if key in (ENTITY_DEPARTURE_TIME, ENTITY_DEPARTURE_OVERRIDE):
+            # Departure changed, look at the calendar again on the next update
+            self._calendar_cache = (datetime.min, [])
+
         if not internal:
             # Format time objects properly for logging
             if isinstance(value, time):
@@ -421,9 +599,7 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             self._locked_plan_soc = None
 
         self._save_data()
-
-        if self.data:
-            self.hass.async_create_task(self.async_refresh())
+        self._schedule_settings_refresh()
 
     def clear_manual_override(self):
         """Called by the Clear Override button."""
@@ -435,9 +611,21 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         self.user_settings[ENTITY_TARGET_OVERRIDE] = std_target
 
         self._save_data()
+        self._schedule_settings_refresh()
+
+    def _schedule_settings_refresh(self):
+        """Coalesce refreshes from rapid setting changes (e.g. slider drags)."""
+        if not self.data or self._settings_refresh_unsub:
+            return
+        self._settings_refresh_unsub = self.hass.loop.call_later(
+            SETTINGS_REFRESH_DELAY, self._async_settings_refresh
+        )
 
-        if self.data:
-            self.hass.async_create_task(self.async_refresh())
+    @callback
+    def _async_settings_refresh(self):
+        """Replan with the settings collected during the debounce window."""
+        self._settings_refresh_unsub = None
+        self.hass.async_create_task(self.async_refresh())
 
     async def async_trigger_report_generation(self):
         """Manually trigger image generation for the current or last session."""
@@ -452,13 +640,12 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             report = self.session_manager.last_session_data
 
         if report:
-            save_path = self.hass.config.path(
-                "www", "ev_optimizer_last_session.png"
-            )
-            await self.hass.async_add_executor_job(
-                generate_report_image, report, save_path
-            )
-            self._add_log("Report Image Generated")
+            if await self._async_render_image(
+                generate_report_image, report, "ev_optimizer_last_session.png", report
+            ):
+                self._add_log("Report Image Generated")
+            else:
+                _LOGGER.debug("Report image unchanged, skipping render")
         else:
             _LOGGER.warning("No session data available to generate report.")
 
@@ -475,11 +662,36 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         )
         data_with_fees[ENTITY_PRICE_VAT] = self.user_settings.get(ENTITY_PRICE_VAT, 0.0)
 
-        save_path = self.hass.config.path("www", "ev_optimizer_plan.png")
-        await self.hass.async_add_executor_job(
-            generate_plan_image, data_with_fees, save_path
-        )
-        self._add_log("Plan Image Generated")
+        if await self._async_render_image(
+            generate_plan_image,
+            data_with_fees,
+            "ev_optimizer_plan.png",
+            {key: data_with_fees.get(key) for key in _PLAN_IMAGE_KEYS},
+        ):
+            self._add_log("Plan Image Generated")
+        else:
+            _LOGGER.debug("Plan image unchanged, skipping render")
+
+    async def _async_render_image(
+        self, renderer, payload: dict, filename: str, content
+    ) -> bool:
+        """Render an image into www/ unless it already shows the same content.
+
+        `content` is the part of the payload the renderer draws. Returns True
+        if the renderer ran.
+        """
+        content_key = hash(json.dumps(content, sort_keys=True, default=str))
+        save_path = self.hass.config.path("www", filename)
+        if self._rendered_image_keys.get(
+            filename
+        ) == content_key and await self.hass.async_add_executor_job(
+            os.path.exists, save_path
+        ):
+            return False
+
+        await self.hass.async_add_executor_job(renderer, payload, save_path)
+        self._rendered_image_keys[filename] = content_key
+        return True
 
     def _get_plan_signature(self, plan: dict) -> str:
         """Generate a signature from a plan to detect meaningful changes.
@@ -548,21 +760,55 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             )
             data_with_fees[ENTITY_PRICE_VAT] = self.user_settings.get(ENTITY_PRICE_VAT, 0.0)
 
-            save_path = self.hass.config.path("www", "ev_optimizer_plan.png")
-            await self.hass.async_add_executor_job(
-                generate_plan_image, data_with_fees, save_path
+            await self._async_render_image(
+                generate_plan_image,
+                data_with_fees,
+                "ev_optimizer_plan.png",
+                {key: data_with_fees.get(key) for key in _PLAN_IMAGE_KEYS},
             )
-            
+
             # Update signature to avoid regenerating
             self._last_plan_image_signature = current_signature
             self._add_log("Plan Image Auto-Generated")
             
         except Exception as e:
-            _LOGGER.warning(f"Could not auto-generate plan image: {e}")
+            _LOGGER.warning("Could not auto-generate plan image: %s", e)
+
+    async def _fetch_calendar_events(self, now: datetime) -> list:
+        """Return calendar events for the next 48h, cached for CALENDAR_CACHE_TTL."""
+        cal_entity = self.conf_keys.get("calendar")
+        if not cal_entity:
+            return []
+
+        expires_at, cached_events = self._calendar_cache
+        if now < expires_at:
+            return cached_events
+
+        events = []
+        try:
+            resp = await self.hass.services.async_call(
+                "calendar",
+                "get_events",
+                {
+                    "entity_id": cal_entity,
+                    "start_date_time": now.isoformat(),
+                    "end_date_time": (now + timedelta(hours=48)).isoformat(),
+                },
+                blocking=True,
+                return_response=True,
+            )
+            if resp and cal_entity in resp:
+                events = resp[cal_entity].get("events", [])
+            self._calendar_cache = (now + CALENDAR_CACHE_TTL, events)
+        except Exception as e:
+            _LOGGER.warning("Failed to fetch calendar events: %s", e)
+        return events
 
     async def _async_update_data(self):
         """Update data via library."""
         start_time = perf_counter()
+        # One wall-clock reading shared by every step of this update cycle
+        now = datetime.now()
         
         if not self._data_loaded:
             await self._load_data()
@@ -572,34 +818,18 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             data.update(self.user_settings)
 
             # Track when tomorrow's prices become available
-            self._track_price_arrival(data.get("price_data", {}))
-
-            cal_entity = self.conf_keys.get("calendar")
-            data["calendar_events"] = []
-            if cal_entity:
-                try:
-                    now = datetime.now()
-                    resp = await self.hass.services.async_call(
-                        "calendar",
-                        "get_events",
-                        {
-                            "entity_id": cal_entity,
-                            "start_date_time": now.isoformat(),
-                            "end_date_time": (now + timedelta(hours=48)).isoformat(),
-                        },
-                        blocking=True,
-                        return_response=True,
-                    )
-                    if resp and cal_entity in resp:
-                        data["calendar_events"] = resp[cal_entity].get("events", [])
-                except Exception as e:
-                    _LOGGER.warning(f"Failed to fetch calendar events: {e}")
+            self._track_price_arrival(data.get("price_data", {}), now)
 
-            await self._handle_plugged_event(data["car_plugged"], data)
+            # The calendar lookup is independent of plug handling, which may issue
+            # its own service calls, so let both run at the same time.
+            data["calendar_events"], _ = await asyncio.gather(
+                self._fetch_calendar_events(now),
+                self._handle_plugged_event(data["car_plugged"], data),
+            )
             # Save last_sensor_soc BEFORE _update_virtual_soc modifies it, so we can detect
             # real sensor changes after the fact (the function updates _last_sensor_soc internally).
             _prev_sensor_soc = self._last_sensor_soc
-            trust_sensor_period = self._update_virtual_soc(data)
+            trust_sensor_period = self._update_virtual_soc(data, now)
             data["car_soc"] = self._virtual_soc
             data["soc_sensor_refresh"] = trust_sensor_period
 
@@ -661,7 +891,7 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                 )
                 plan = self._locked_plan.copy()
                 # Update should_charge_now based on current time and schedule
-                plan = self._update_locked_plan_status(plan)
+                plan = self._update_locked_plan_status(plan, now)
                 plan_is_locked = True
             else:
                 # Generate new plan
@@ -705,31 +935,30 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
 
             # Buffer logic: keep charging for 15min after scheduled end
             if not plan["should_charge_now"] and self._last_scheduled_end:
-                now_dt = datetime.now()
                 buffer_end = self._last_scheduled_end + timedelta(minutes=15)
-                if self._last_scheduled_end <= now_dt < buffer_end:
+                if self._last_scheduled_end <= now < buffer_end:
                     _LOGGER.warning(
                         "🚨 Buffer Logic Override: Forcing charge because current time %s is "
                         "within 15min buffer after last_scheduled_end %s",
-                        now_dt.strftime("%H:%M:%S"),
+                        now.strftime("%H:%M:%S"),
                         self._last_scheduled_end.strftime("%H:%M:%S")
                     )
                     plan["should_charge_now"] = True
                     plan["charging_summary"] = "Charging Buffer Active."
-                elif now_dt >= buffer_end:
+                elif now >= buffer_end:
                     # Clear old scheduled end if we're past the buffer
                     _LOGGER.debug(
                         "📍 Clearing old scheduled_end %s (now %s, buffer expired)",
                         self._last_scheduled_end.strftime("%H:%M:%S"),
-                        now_dt.strftime("%H:%M:%S")
+                        now.strftime("%H:%M:%S")
                     )
                     self._last_scheduled_end = None
 
             data.update(plan)
 
-            await self._manage_car_refresh(data, plan)
-            await self._apply_charger_control(data, plan)
-            self._record_session_data(data)
+            await self._manage_car_refresh(data, plan, now)
+            await self._apply_charger_control(data, plan, now)
+            self._record_session_data(data, now)
             data["action_log"] = self.session_manager.action_log
             data["last_session_data"] = self.session_manager.last_session_data
             
@@ -741,18 +970,30 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             )
             self._actions_this_update = []  # Reset for next update
 
+            self._adjust_update_interval(data.get("car_plugged", False))
+
             # Performance Logging
             duration = perf_counter() - start_time
             data["latency_ms"] = round(duration * 1000, 2)
-            _LOGGER.debug(f"Data Update & Logic completed in {duration:.4f}s")
+            _LOGGER.debug("Data Update & Logic completed in %.4fs", duration)
 
             return data
 
         except Exception as err:
-            _LOGGER.error(f"Error in EV Coordinator: {err}")
+            _LOGGER.error("Error in EV Coordinator: %s", err)
             raise UpdateFailed(f"Error communicating with API: {err}")
 
-    async def _manage_car_refresh(self, data: dict, plan: dict):
+    def _adjust_update_interval(self, car_plugged: bool):
+        """Poll at the base interval while plugged in, back off while unplugged."""
+        desired = self._base_update_interval if car_plugged else UPDATE_INTERVAL_UNPLUGGED
+        if self.update_interval != desired:
+            _LOGGER.debug(
+                "Changing update interval to %ss (car plugged: %s)",
+                desired.total_seconds(), car_plugged,
+            )
+            self.update_interval = desired
+
+    async def _manage_car_refresh(self, data: dict, plan: dict, now: datetime | None = None):
         if not data.get("car_plugged"):
             return
 
@@ -763,45 +1004,39 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
 
         if not svc or not ent or interval_mode == REFRESH_NEVER:
             return
-        
+
+        if now is None:
+            now = datetime.now()
+
         # CRITICAL: Force refresh when first entering maintenance mode to get accurate final SoC
         # This prevents graph dips from stale sensor values
         maintenance_now = "Maintenance mode active" in plan.get("charging_summary", "")
-        if maintenance_now and self._last_applied_state == "charging":
+        if maintenance_now and self._charger_state.applied_state == "charging":
             _LOGGER.debug("📊 Entering maintenance mode - triggering immediate refresh for final SoC")
-            await self._trigger_car_refresh(svc, ent, trigger_learning=False)
+            await self._trigger_car_refresh(svc, ent, trigger_learning=False, now=now)
             return
 
-        now = datetime.now()
-
-        if self._last_car_refresh_time:
-            delta = now - self._last_car_refresh_time
+        if self._last_car_refresh_monotonic is not None:
+            delta = timedelta(seconds=monotonic() - self._last_car_refresh_monotonic)
         else:
             delta = timedelta(days=365)
 
-        should_refresh = False
-
-        if interval_mode == REFRESH_30_MIN and delta > timedelta(minutes=30):
-            should_refresh = True
-        elif interval_mode == REFRESH_1_HOUR and delta > timedelta(hours=1):
-            should_refresh = True
-        elif interval_mode == REFRESH_2_HOURS and delta > timedelta(hours=2):
-            should_refresh = True
-        elif interval_mode == REFRESH_3_HOURS and delta > timedelta(hours=3):
-            should_refresh = True
-        elif interval_mode == REFRESH_4_HOURS and delta > timedelta(hours=4):
-            should_refresh = True
-        elif interval_mode == REFRESH_AT_TARGET:
+        if interval_mode == REFRESH_AT_TARGET:
             # Smart refresh mode with learning
-            should_refresh, trigger_learning = self._should_trigger_smart_refresh(plan, delta)
+            should_refresh, trigger_learning = self._should_trigger_smart_refresh(plan, delta, now)
             if should_refresh:
-                await self._trigger_car_refresh(svc, ent, trigger_learning=trigger_learning)
+                await self._trigger_car_refresh(
+                    svc, ent, trigger_learning=trigger_learning, now=now
+                )
             return
 
-        if should_refresh:
-            await self._trigger_car_refresh(svc, ent, trigger_learning=False)
+        threshold = REFRESH_INTERVALS.get(interval_mode)
+        if threshold is not None and delta > threshold:
+            await self._trigger_car_refresh(svc, ent, trigger_learning=False, now=now)
 
-    def _should_trigger_smart_refresh(self, plan: dict, time_since_last: timedelta) -> tuple[bool, bool]:
+    def _should_trigger_smart_refresh(
+        self, plan: dict, time_since_last: timedelta, now: datetime | None = None
+    ) -> tuple[bool, bool]:
         """Determine if smart refresh should be triggered for efficiency learning.
         
         Returns:
@@ -826,7 +1061,8 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             except Exception:
                 return (False, False)
         
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         session_start_str = self.session_manager.current_session.get("start_time")
         if session_start_str:
             session_start = datetime.fromisoformat(session_start_str) if isinstance(session_start_str, str) else session_start_str
@@ -887,7 +1123,13 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         
         return (False, False)
 
-    async def _trigger_car_refresh(self, service: str, entity_id: str, trigger_learning: bool = False):
+    async def _trigger_car_refresh(
+        self,
+        service: str,
+        entity_id: str,
+        trigger_learning: bool = False,
+        now: datetime | None = None,
+    ):
         try:
             # Store virtual SoC BEFORE refresh to compare with actual after (if learning)
             if trigger_learning:
@@ -904,9 +1146,11 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             else:
                 payload["device_id"] = entity_id
 
-            await self.hass.services.async_call(domain, name, payload, blocking=True)
-            refresh_time = datetime.now()
-            self._last_car_refresh_time = refresh_time
+            # Don't wait for the car's cloud API; the new SoC is picked up by later
+            # updates and the trust window below starts at the request.
+            await self.hass.services.async_call(domain, name, payload, blocking=False)
+            refresh_time = now if now is not None else datetime.now()
+            self._last_car_refresh_monotonic = monotonic()
             self._refresh_trigger_timestamp = refresh_time
             
             # Only schedule learning evaluation if this is a learning refresh
@@ -917,7 +1161,7 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                     # Schedule evaluation after a delay to allow SoC to update
                     self.hass.async_create_task(self._evaluate_efficiency_after_delay(refresh_time))
         except Exception as e:
-            _LOGGER.error(f"Failed to force refresh car: {e}")
+            _LOGGER.error("Failed to force refresh car: %s", e)
 
     async def _evaluate_efficiency_after_delay(self, refresh_time: datetime):
         """Wait for SoC to update, then evaluate efficiency learning."""
@@ -1045,13 +1289,14 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         # Save state
         self._save_data()
 
-    def _update_locked_plan_status(self, locked_plan: dict) -> dict:
+    def _update_locked_plan_status(self, locked_plan: dict, now: datetime | None = None) -> dict:
         """Update should_charge_now in locked plan based on current time and schedule.
         
         This allows the locked plan to continue executing its charging schedule
         without recalculating the entire plan.
         """
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         schedule = locked_plan.get("charging_schedule", [])
         
         # Check if current time is within any active charging slot
@@ -1068,8 +1313,9 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         locked_plan["should_charge_now"] = should_charge
         return locked_plan
 
-    def _update_virtual_soc(self, data: dict):
-        current_time = datetime.now()
+    def _update_virtual_soc(self, data: dict, now: datetime | None = None):
+        current_time = now if now is not None else datetime.now()
+        current_monotonic = monotonic()
         sensor_soc = data.get("car_soc")
 
         # Validate the underlying HA state so we don't treat unavailable/unknown as a real 0.0
@@ -1099,7 +1345,7 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
 
         # Treat both "charging" and "maintenance" as actively connected (car plugged in)
         # Don't trust stale downward sensor movements in either state
-        actively_charging = self._last_applied_state in ("charging", "maintenance")
+        actively_charging = self._charger_state.applied_state in ("charging", "maintenance")
         
         # Check if sensor value actually changed (indicating a real update from the car)
         sensor_value_changed = (
@@ -1118,8 +1364,11 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                 if trust_sensor_period or sensor_value_changed or self._virtual_soc == 0.0:
                     self._virtual_soc = sensor_soc_f
                     _LOGGER.debug(
-                        f"Virtual SoC updated to {sensor_soc_f:.1f}% while plugged in "
-                        f"(forced_refresh={trust_sensor_period}, value_changed={sensor_value_changed})"
+                        "Virtual SoC updated to %.1f%% while plugged in "
+                        "(forced_refresh=%s, value_changed=%s)",
+                        sensor_soc_f,
+                        trust_sensor_period,
+                        sensor_value_changed,
                     )
                 # else: ignore unchanged sensor value while plugged in; rely purely on virtual estimator
             else:
@@ -1134,37 +1383,36 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             # Update last sensor value for next comparison
             self._last_sensor_soc = sensor_soc_f
 
-        if self._last_applied_state == "charging":
+        if self._charger_state.applied_state == "charging":
             ch_l1 = data.get("ch_l1", 0.0)
             ch_l2 = data.get("ch_l2", 0.0)
             ch_l3 = data.get("ch_l3", 0.0)
             measured_amps = max(ch_l1, ch_l2, ch_l3)
             used_amps = (
-                measured_amps if measured_amps > 0.5 else self._last_applied_amps
+                measured_amps if measured_amps > 0.5 else self._charger_state.applied_amps
             )
 
             if used_amps > 0:
-                seconds_passed = (current_time - self._last_update_time).total_seconds()
+                seconds_passed = current_monotonic - self._last_update_monotonic
                 hours_passed = seconds_passed / 3600.0
-                estimated_power_kw = (3 * 230 * used_amps) / 1000.0
-                efficiency_pct = self.entry.data.get(CONF_CHARGER_LOSS, 10.0)
-                efficiency_factor = 1.0 - (efficiency_pct / 100.0)
-                added_kwh = estimated_power_kw * hours_passed * efficiency_factor
+                added_kwh = used_amps * self._kw_per_amp_eff * hours_passed
 
                 if self.car_capacity > 0:
                     added_percent = (added_kwh / self.car_capacity) * 100.0
                     self._virtual_soc += added_percent
-                    if self._last_applied_car_limit > 0:
-                        if self._virtual_soc > self._last_applied_car_limit:
-                            self._virtual_soc = float(self._last_applied_car_limit)
+                    if self._charger_state.applied_car_limit > 0:
+                        if self._virtual_soc > self._charger_state.applied_car_limit:
+                            self._virtual_soc = float(self._charger_state.applied_car_limit)
                     if self._virtual_soc > 100.0:
                         self._virtual_soc = 100.0
 
-        self._last_update_time = current_time
+        self._last_update_monotonic = current_monotonic
         return trust_sensor_period
 
-    async def _apply_charger_control(self, data: dict, plan: dict):
-        if datetime.now() - self._startup_time < timedelta(minutes=2):
+    async def _apply_charger_control(self, data: dict, plan: dict, now: datetime | None = None):
+        if now is None:
+            now = datetime.now()
+        if monotonic() - self._startup_monotonic < STARTUP_GRACE_SECONDS:
             return
 
         if not data.get("car_plugged", False):
@@ -1190,7 +1438,6 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                     )
                     # Track actual minutes lost to overload prevention
                     # (handles variable update intervals from P1 listener triggers)
-                    now = datetime.now()
                     if self._last_overload_check_time is not None:
                         elapsed_seconds = (now - self._last_overload_check_time).total_seconds()
                         elapsed_minutes = elapsed_seconds / 60.0
@@ -1205,11 +1452,42 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             desired_state = "charging" if should_charge else "paused"
 
         target_soc = int(plan.get("planned_target_soc", 80))
+
+        # Mark that we charged in this interval (only if we actually drew current)
+        if should_charge and target_amps > 0:
+            self.session_manager.mark_charging_in_interval()
+
+        # Nothing to send if this exact control state was already applied successfully
+        desired_control = (desired_state, target_amps, target_soc)
+        if desired_control == self._charger_state.applied_control:
+            return
+
         is_starting = (
-            desired_state == "charging" and self._last_applied_state != "charging"
+            desired_state == "charging" and self._charger_state.applied_state != "charging"
         )
 
-        if target_soc != self._last_applied_car_limit or is_starting:
+        if is_starting:
+            # The car must have its new limit before the charger resumes, or it
+            # may charge past it on a stale setting
+            car_limit_ok = await self._apply_car_limit(target_soc, is_starting)
+            charger_ok = await self._apply_zaptec_control(
+                data, should_charge, desired_state, target_amps
+            )
+        else:
+            # In steady state the car limit and the Zaptec commands target
+            # different integrations, so send them concurrently. Ordering within
+            # the Zaptec sequence is kept.
+            car_limit_ok, charger_ok = await asyncio.gather(
+                self._apply_car_limit(target_soc, is_starting),
+                self._apply_zaptec_control(data, should_charge, desired_state, target_amps),
+            )
+        self._charger_state.applied_control = (
+            desired_control if car_limit_ok and charger_ok else None
+        )
+
+    async def _apply_car_limit(self, target_soc: int, is_starting: bool) -> bool:
+        """Push the charge limit to the car. Returns False if a call failed."""
+        if target_soc != self._charger_state.applied_car_limit or is_starting:
             if self.conf_keys["car_limit"]:
                 try:
                     await self.hass.services.async_call(
@@ -1218,10 +1496,10 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                         {"entity_id": self.conf_keys["car_limit"], "value": target_soc},
                         blocking=True,
                     )
-                    self._last_applied_car_limit = target_soc
+                    self._charger_state.applied_car_limit = target_soc
                     self._add_log(f"Set Car Limit: {target_soc}%")
                 except Exception:
-                    pass
+                    return False
             elif self.conf_keys.get("car_svc") and self.conf_keys.get("car_target_ent"):
                 try:
                     full = self.conf_keys["car_svc"]
@@ -1233,17 +1511,20 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                     else:
                         pl["device_id"] = tid
                     await self.hass.services.async_call(dom, svc, pl, blocking=True)
-                    self._last_applied_car_limit = target_soc
+                    self._charger_state.applied_car_limit = target_soc
                     self._add_log(f"Service Call: Set Car Limit to {target_soc}%")
                 except Exception as e:
-                    _LOGGER.error(f"Car Limit Service Failed: {e}")
-
+                    _LOGGER.error("Car Limit Service Failed: %s", e)
+                    return False
+        return True
+
+    async def _apply_zaptec_control(
+        self, data: dict, should_charge: bool, desired_state: str, target_amps: int
+    ) -> bool:
+        """Switch the charger and set its current limit. Returns False if a call failed."""
+        ok = True
         if should_charge:
-            # Mark that we charged in this interval (only if we actually drew current)
-            if target_amps > 0:
-                self.session_manager.mark_charging_in_interval()
-
-            if desired_state != self._last_applied_state:
+            if desired_state != self._charger_state.applied_state:
                 try:
                     if self.conf_keys.get("zap_switch"):
                         await self.hass.services.async_call(
@@ -1266,11 +1547,12 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                         )
                         self._add_log("Sent Resume command")
                         self._add_log(f"Setting charger to {int(target_amps)}A")
-                    self._last_applied_state = desired_state
+                    self._charger_state.applied_state = desired_state
                 except Exception as e:
-                    _LOGGER.error(f"Failed to switch Zaptec state to CHARGING: {e}")
+                    ok = False
+                    _LOGGER.error("Failed to switch Zaptec state to CHARGING: %s", e)
 
-            if target_amps != self._last_applied_amps and self.conf_keys["zap_limit"]:
+            if target_amps != self._charger_state.applied_amps and self.conf_keys["zap_limit"]:
                 try:
                     # Cap at Zaptec entity's max value to prevent out-of-range errors
                     zap_entity = self.hass.states.get(self.conf_keys["zap_limit"])
@@ -1279,7 +1561,9 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                         if entity_max is not None:
                             if target_amps > entity_max:
                                 _LOGGER.warning(
-                                    f"⚠️ Capping Zaptec limit from {target_amps}A to entity max {entity_max}A"
+                                    "⚠️ Capping Zaptec limit from %sA to entity max %sA",
+                                    target_amps,
+                                    entity_max,
                                 )
                                 target_amps = entity_max
                     
@@ -1292,16 +1576,17 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                         },
                         blocking=True,
                     )
-                    self._last_applied_amps = target_amps
+                    self._charger_state.applied_amps = target_amps
                     if target_amps > 0:
                         self._add_log(
                             f"Adjusted charger to {int(target_amps)}A (Load Balancing)"
                         )
                 except Exception as e:
-                    _LOGGER.error(f"Failed to set Zaptec limit: {e}")
+                    ok = False
+                    _LOGGER.error("Failed to set Zaptec limit: %s", e)
 
         else:
-            is_stopping = self._last_applied_state in ("charging", "maintenance")
+            is_stopping = self._charger_state.applied_state in ("charging", "maintenance")
 
             # Only touch the Zaptec limiter when we are actively stopping charging.
             # Outside planned charging windows we keep the limiter unchanged to avoid
@@ -1314,12 +1599,13 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                         {"entity_id": self.conf_keys["zap_limit"], "value": 0},
                         blocking=True,
                     )
-                    self._last_applied_amps = 0
+                    self._charger_state.applied_amps = 0
                     self._add_log(f"Pausing: Set Zaptec limit to 0A")
                 except Exception as e:
-                    _LOGGER.error(f"Failed to set Zaptec limit to 0: {e}")
+                    ok = False
+                    _LOGGER.error("Failed to set Zaptec limit to 0: %s", e)
 
-            if desired_state != self._last_applied_state:
+            if desired_state != self._charger_state.applied_state:
                 try:
                     if self.conf_keys.get("zap_switch"):
                         # If the car is plugged in, keep the charger enabled so the pilot
@@ -1343,69 +1629,31 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                             blocking=True,
                         )
                         self._add_log("Sent Stop command")
-                    self._last_applied_state = desired_state
+                    self._charger_state.applied_state = desired_state
                 except Exception as e:
-                    _LOGGER.error(f"Failed to switch Zaptec state to PAUSED: {e}")
+                    ok = False
+                    _LOGGER.error("Failed to switch Zaptec state to PAUSED: %s", e)
+        return ok
 
     def _fetch_sensor_data(self) -> dict:
-        data = {}
-
-        def get_float(entity_id):
-            if not entity_id:
-                return 0.0
-            state = self.hass.states.get(entity_id)
-            if state is None or state.state in [STATE_UNAVAILABLE, STATE_UNKNOWN]:
-                return 0.0
-            try:
-                return float(state.state)
-            except ValueError:
-                return 0.0
-
-        def get_state(entity_id):
-            return self.hass.states.get(entity_id) if entity_id else None
-
-        data["p1_l1"] = get_float(self.conf_keys["p1_l1"])
-        data["p1_l2"] = get_float(self.conf_keys["p1_l2"])
-        data["p1_l3"] = get_float(self.conf_keys["p1_l3"])
-        data["car_soc"] = get_float(self.conf_keys["car_soc"])
-        data["ch_l1"] = get_float(self.conf_keys.get("ch_l1"))
-        data["ch_l2"] = get_float(self.conf_keys.get("ch_l2"))
-        data["ch_l3"] = get_float(self.conf_keys.get("ch_l3"))
-        # Read Zaptec limiter value for load balancing fallback
-        data["zap_limit_value"] = get_float(self.conf_keys.get("zap_limit"))
-
-        plugged_state = get_state(self.conf_keys["car_plugged"])
+        states = self.hass.states
+        cache = self._state_float_cache
+        # Built in one comprehension; car_plugged and price_data are added below
+        data = {
+            key: _state_float(states, entity_id, cache)
+            for key, entity_id in self._float_entities
+        }
+
+        conf_keys = self.conf_keys
+        plugged_entity = conf_keys["car_plugged"]
+        plugged_state = states.get(plugged_entity) if plugged_entity else None
         if plugged_state:
             raw_state = str(plugged_state.state)
             normalized = raw_state.strip().lower()
 
-            truthy_states = {
-                "on",
-                "true",
-                "connected",
-                "charging",
-                "full",
-                "plugged_in",
-                "plugged",
-                "yes",
-                "y",
-                "1",
-            }
-            falsy_states = {
-                "off",
-                "false",
-                "disconnected",
-                "unplugged",
-                "no",
-                "n",
-                "0",
-                STATE_UNKNOWN,
-                STATE_UNAVAILABLE,
-            }
-
-            if normalized in truthy_states:
+            if normalized in _PLUGGED_TRUE_STATES:
                 data["car_plugged"] = True
-            elif normalized in falsy_states:
+            elif normalized in _PLUGGED_FALSE_STATES:
                 data["car_plugged"] = False
             else:
                 # Fallback: numeric parsing (e.g. 0/1, 0.0/1.0)
@@ -1417,17 +1665,14 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                         self._last_unknown_plugged_state = normalized
                         _LOGGER.warning(
                             "Unexpected plugged sensor state for %s: '%s' (treating as unplugged)",
-                            self.conf_keys.get("car_plugged"),
+                            plugged_entity,
                             raw_state,
                         )
         else:
             data["car_plugged"] = False
-        price_entity = self.conf_keys.get("price")
-        data["price_data"] = (
-            self.hass.states.get(price_entity).attributes
-            if price_entity and self.hass.states.get(price_entity)
-            else {}
-        )
+        price_entity = conf_keys["price"]
+        price_state = states.get(price_entity) if price_entity else None
+        data["price_data"] = price_state.attributes if price_state else {}
         return data
 
     async def _handle_plugged_event(self, is_plugged, data):
@@ -1439,9 +1684,7 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             # CRITICAL FIX: Clear old session state to prevent buffer logic from interfering
             # When car plugs in, we MUST clear any buffered state from previous session
             self._last_scheduled_end = None
-            self._last_applied_state = None
-            self._last_applied_amps = -1
-            self._last_applied_car_limit = -1
+            self._charger_state.reset()
             
             # Clear locked plan for new session
             self._locked_plan = None
@@ -1496,23 +1739,29 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
 
             if self.conf_keys.get("zap_switch"):
                 try:
+                    # Nothing follows that depends on the switch having turned off
                     await self.hass.services.async_call(
                         "switch",
                         SERVICE_TURN_OFF,
                         {"entity_id": self.conf_keys["zap_switch"]},
-                        blocking=True,
+                        blocking=False,
                     )
                 except:
                     pass
-            self._last_applied_state = "paused"
-            self._last_applied_car_limit = -1
+            self._charger_state.applied_state = "paused"
+            self._charger_state.applied_car_limit = -1
+            self._charger_state.applied_control = None
             self._last_scheduled_end = None
 
         self.previous_plugged_state = is_plugged
 
-    def _record_session_data(self, data):
+    def _record_session_data(self, data, now: datetime | None = None):
         self.session_manager.record_data_point(
-            data, self.user_settings, self._last_applied_amps, self._last_applied_state
+            data,
+            self.user_settings,
+            self._charger_state.applied_amps,
+            self._charger_state.applied_state,
+            now,
         )
 
     def _finalize_session(self, final_soc=None):
@@ -1535,45 +1784,40 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                 self.hass.async_add_executor_job(generate_report_image, report, save_path)
                 self._add_log("Session Report Image Auto-Generated")
             except Exception as e:
-                _LOGGER.warning(f"Could not auto-generate report image: {e}")
+                _LOGGER.warning("Could not auto-generate report image: %s", e)
     
-    def dump_debug_state(self) -> dict:
+    def dump_debug_state(self, now: datetime | None = None) -> dict:
         """Dump complete state for debugging/simulation purposes.
         
         Returns a comprehensive snapshot of all inputs to the planner that can be
         used to reproduce the exact charging decision in isolation.
+        `now` stamps the dump (defaults to the current time).
         """
-        import json
-        from datetime import datetime
-        
         _LOGGER.debug("🔍 Starting debug state dump...")
         
         # Get current data snapshot
         data = self.data if self.data else {}
+        price_data = data.get("price_data", {})
+        timestamp = (now if now is not None else datetime.now()).isoformat()
+        config_settings = self.config_settings.copy()
+
+        settings = self.user_settings
+        user_settings = {
+            key: settings.get(key, default) for key, default in _DEBUG_USER_SETTING_DEFAULTS
+        }
+        user_settings[ENTITY_DEPARTURE_TIME] = str(user_settings[ENTITY_DEPARTURE_TIME])
+        user_settings[ENTITY_DEPARTURE_OVERRIDE] = str(user_settings[ENTITY_DEPARTURE_OVERRIDE])
         
         # Build comprehensive debug dump
         debug_dump = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "description": "Complete state dump for ev_optimizer debugging/simulation",
             
             # Configuration
-            "config_settings": self.config_settings.copy(),
+            "config_settings": config_settings,
             
             # User settings from UI
-            "user_settings": {
-                ENTITY_TARGET_SOC: self.user_settings.get(ENTITY_TARGET_SOC, 80),
-                ENTITY_MIN_SOC: self.user_settings.get(ENTITY_MIN_SOC, 20),
-                ENTITY_DEPARTURE_TIME: str(self.user_settings.get(ENTITY_DEPARTURE_TIME, time(7, 0))),
-                ENTITY_DEPARTURE_OVERRIDE: str(self.user_settings.get(ENTITY_DEPARTURE_OVERRIDE, time(7, 0))),
-                ENTITY_SMART_SWITCH: self.user_settings.get(ENTITY_SMART_SWITCH, True),
-                ENTITY_TARGET_OVERRIDE: self.user_settings.get(ENTITY_TARGET_OVERRIDE, 80),
-                ENTITY_PRICE_LIMIT_1: self.user_settings.get(ENTITY_PRICE_LIMIT_1, 0.5),
-                ENTITY_TARGET_SOC_1: self.user_settings.get(ENTITY_TARGET_SOC_1, 100),
-                ENTITY_PRICE_LIMIT_2: self.user_settings.get(ENTITY_PRICE_LIMIT_2, 1.5),
-                ENTITY_TARGET_SOC_2: self.user_settings.get(ENTITY_TARGET_SOC_2, 80),
-                ENTITY_PRICE_EXTRA_FEE: self.user_settings.get(ENTITY_PRICE_EXTRA_FEE, 0.0),
-                ENTITY_PRICE_VAT: self.user_settings.get(ENTITY_PRICE_VAT, 0.0),
-            },
+            "user_settings": user_settings,
             
             # State flags
             "manual_override_active": self.manual_override_active,
@@ -1595,9 +1839,9 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             
             # Price data (critical for reproducing decisions)
             "price_data": {
-                "today": data.get("price_data", {}).get("today", []),
-                "tomorrow": data.get("price_data", {}).get("tomorrow", []),
-                "tomorrow_valid": data.get("price_data", {}).get("tomorrow_valid", False),
+                "today": price_data.get("today", []),
+                "tomorrow": price_data.get("tomorrow", []),
+                "tomorrow_valid": price_data.get("tomorrow_valid", False),
                 "expected_arrival_time": self._get_expected_price_arrival_time(),
                 "arrival_history": self.learning_state.get(LEARNING_PRICE_ARRIVAL, []),
             },
@@ -1613,14 +1857,14 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             
             # Efficiency learning state
             "efficiency_learning": {
-                "enabled": self.entry.options.get(CONF_CAR_REFRESH_INTERVAL, self.entry.data.get(CONF_CAR_REFRESH_INTERVAL)) in [
+                "enabled": self.conf_keys.get("refresh_int") in [
                     REFRESH_AT_TARGET, REFRESH_1_HOUR, REFRESH_2_HOURS, REFRESH_3_HOURS, REFRESH_4_HOURS
                 ],
                 "learned_loss_pct": self.learning_state.get(LEARNING_CHARGER_LOSS, 0.0),
                 "confidence": self.learning_state.get(LEARNING_CONFIDENCE, 0),
                 "sessions_completed": self.learning_state.get(LEARNING_SESSIONS, 0),
                 "locked": self.learning_state.get(LEARNING_LOCKED, False),
-                "configured_loss_pct": float(self.entry.options.get(CONF_CHARGER_LOSS, self.entry.data.get(CONF_CHARGER_LOSS, DEFAULT_LOSS))),
+                "configured_loss_pct": self._charger_loss_pct,
                 "last_refresh": self.learning_state.get(LEARNING_LAST_REFRESH),
                 "measurement_history": self.learning_state.get(LEARNING_HISTORY, []),
                 "explanation": self._get_learning_explanation(),
@@ -1644,15 +1888,14 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         
         # Save to file
         file_path = self.hass.config.path("www", "ev_optimizer_debug_dump.json")
-        _LOGGER.debug(f"💾 Saving debug dump to: {file_path}")
+        _LOGGER.debug("💾 Saving debug dump to: %s", file_path)
         
         try:
-            import os
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             with open(file_path, 'w') as f:
                 f.write(json_dump)
-            _LOGGER.info(f"✅ Debug dump saved to: {file_path}")
-            _LOGGER.info(f"📥 Download at: /local/ev_optimizer_debug_dump.json")
+            _LOGGER.info("✅ Debug dump saved to: %s", file_path)
+            _LOGGER.info("📥 Download at: /local/ev_optimizer_debug_dump.json")
             
             # Also log to console for easy copy/paste
             _LOGGER.info("=" * 80)
@@ -1662,7 +1905,7 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             _LOGGER.info("=" * 80)
             
         except Exception as e:
-            _LOGGER.error(f"❌ Failed to save debug dump to file: {e}")
+            _LOGGER.error("❌ Failed to save debug dump to file: %s", e)
             # Still log it even if file save fails
             _LOGGER.info("=" * 80)
             _LOGGER.info("DEBUG STATE DUMP (file save failed, logging only)")
@@ -1679,9 +1922,6 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         along with all other current configuration and sensor values.
         If tomorrow's prices are missing, copies today's prices.
         """
-        import json
-        from datetime import datetime, timedelta
-        
         _LOGGER.debug("🔍 Starting custom debug scenario dump...")
         
         # Get debug field values
@@ -1778,7 +2018,7 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
                 "learned_loss_pct": self.learning_state.get(LEARNING_CHARGER_LOSS, 0.0),
                 "confidence": self.learning_state.get(LEARNING_CONFIDENCE, 0),
                 "locked": self.learning_state.get(LEARNING_LOCKED, False),
-                "configured_loss_pct": float(self.entry.options.get(CONF_CHARGER_LOSS, self.entry.data.get(CONF_CHARGER_LOSS, DEFAULT_LOSS))),
+                "configured_loss_pct": self._charger_loss_pct,
             },
         }
         
@@ -1787,40 +2027,43 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
         
         # Save to file
         file_path = self.hass.config.path("www", "ev_optimizer_custom_scenario.json")
-        _LOGGER.debug(f"💾 Saving custom scenario to: {file_path}")
+        _LOGGER.debug("💾 Saving custom scenario to: %s", file_path)
         
         try:
-            import os
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             with open(file_path, 'w') as f:
                 f.write(json_dump)
-            _LOGGER.info(f"✅ Custom scenario saved to: {file_path}")
-            _LOGGER.info(f"📥 Download at: /local/ev_optimizer_custom_scenario.json")
+            _LOGGER.info("✅ Custom scenario saved to: %s", file_path)
+            _LOGGER.info("📥 Download at: /local/ev_optimizer_custom_scenario.json")
             
             # Also log summary
             _LOGGER.info("=" * 80)
             _LOGGER.info("CUSTOM DEBUG SCENARIO SAVED")
             _LOGGER.info("=" * 80)
-            _LOGGER.info(f"Current Time: {debug_current_time}")
-            _LOGGER.info(f"Departure: {debug_departure_time}")
-            _LOGGER.info(f"Current SoC: {debug_current_soc}%")
-            _LOGGER.info(f"Target SoC: {debug_target_soc}%")
-            _LOGGER.info(f"Tomorrow prices: {'faked (copied from today)' if not price_data.get('tomorrow_valid') else 'real'}")
-            _LOGGER.info(f"Download: /local/ev_optimizer_custom_scenario.json")
+            _LOGGER.info("Current Time: %s", debug_current_time)
+            _LOGGER.info("Departure: %s", debug_departure_time)
+            _LOGGER.info("Current SoC: %s%%", debug_current_soc)
+            _LOGGER.info("Target SoC: %s%%", debug_target_soc)
+            _LOGGER.info(
+                "Tomorrow prices: %s",
+                "real" if price_data.get("tomorrow_valid") else "faked (copied from today)",
+            )
+            _LOGGER.info("Download: /local/ev_optimizer_custom_scenario.json")
             _LOGGER.info("=" * 80)
             
         except Exception as e:
-            _LOGGER.error(f"❌ Failed to save custom scenario to file: {e}")
+            _LOGGER.error("❌ Failed to save custom scenario to file: %s", e)
         
         return custom_dump
 
-    def _track_price_arrival(self, price_data: dict):
+    def _track_price_arrival(self, price_data: dict, now: datetime | None = None):
         """Track when tomorrow's prices become available to learn the pattern."""
         tomorrow_valid = price_data.get("tomorrow_valid", False) or bool(price_data.get("tomorrow"))
         
         # Detect transition from no tomorrow prices to having tomorrow prices
         if tomorrow_valid and not self._last_tomorrow_valid:
-            now = datetime.now()
+            if now is None:
+                now = datetime.now()
             arrival_time = now.strftime("%H:%M")
             
             # Add to history (keep last 14 days)
@@ -1835,7 +2078,11 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
             price_arrivals = price_arrivals[-14:]
             self.learning_state[LEARNING_PRICE_ARRIVAL] = price_arrivals
             
-            _LOGGER.info(f"📅 Tomorrow's prices detected at {arrival_time}. Learning pattern ({len(price_arrivals)} samples).")
+            _LOGGER.info(
+                "📅 Tomorrow's prices detected at %s. Learning pattern (%d samples).",
+                arrival_time,
+                len(price_arrivals),
+            )
             
             # Save learning state
             self._save_data()
@@ -1877,18 +2124,14 @@ class EVSmartChargerCoordinator(DataUpdateCoordinator):
 
     def _get_learning_explanation(self) -> str:
         """Generate a human-readable explanation of the learning state."""
-        # Helper to get config from Options (new) or Data (initial)
-        def get_conf(key, default=None):
-            return self.entry.options.get(key, self.entry.data.get(key, default))
-        
-        refresh_mode = get_conf(CONF_CAR_REFRESH_INTERVAL)
+        refresh_mode = self.conf_keys.get("refresh_int")
         
         # Check if learning is enabled
         if refresh_mode not in [REFRESH_AT_TARGET, REFRESH_1_HOUR, REFRESH_2_HOURS, REFRESH_3_HOURS, REFRESH_4_HOURS]:
             return "Adaptive efficiency learning is DISABLED. Car refresh mode is set to 'Never' or not configured. The system uses the fixed configured loss percentage."
         
         # Learning is enabled
-        configured_loss = float(get_conf(CONF_CHARGER_LOSS, DEFAULT_LOSS))
+        configured_loss = self._charger_loss_pct
         learned_loss = self.learning_state.get(LEARNING_CHARGER_LOSS, configured_loss)
         confidence = self.learning_state.get(LEARNING_CONFIDENCE, 0)
         sessions = self.learning_state.get(LEARNING_SESSIONS, 0)
@@ -26,14 +26,23 @@ async def async_get_config_entry_diagnostics(
         "manual_override_active": coordinator.manual_override_active,
         "user_settings": coordinator.user_settings,
         "last_applied_state": {
-            "amps": coordinator._last_applied_amps,
-            "state": coordinator._last_applied_state,
-            "car_limit": coordinator._last_applied_car_limit,
+            "amps": coordinator._charger_state.applied_amps,
+            "state": coordinator._charger_state.applied_state,
+            "car_limit": coordinator._charger_state.applied_car_limit,
         },
         "virtual_soc": coordinator._virtual_soc,
         # Add session data to diagnostics
-        "current_session": coordinator.session_manager.current_session,
+        "current_session": _session_for_diagnostics(
+            coordinator.session_manager.current_session
+        ),
         "last_session": coordinator.session_manager.last_session_data,
     }
 
-    return data
\ No newline at end of file
+    return data
+
+
+def _session_for_diagnostics(session: dict | None) -> dict | None:
+    """Return the active session with its history as JSON-friendly point dicts."""
+    if session is None:
+        return None
+    return {**session, "history": list(session["history"]), "log": list(session["log"])}
@@ -39,6 +39,7 @@ class EVSmartChargerBaseSensor(CoordinatorEntity, SensorEntity):
 
 class EVSmartChargerStatusSensor(EVSmartChargerBaseSensor):
     """Sensor showing the overall status."""
+
     _attr_name = "Charger Logic Status"
     _attr_unique_id = "ev_optimizer_status"
     _attr_icon = "mdi:ev-station"
@@ -65,6 +66,7 @@ class EVSmartChargerStatusSensor(EVSmartChargerBaseSensor):
 
 class EVMaxAvailableCurrentSensor(EVSmartChargerBaseSensor):
     """Sensor showing max safe current."""
+
     _attr_name = "Max Safe Current"
     _attr_unique_id = "ev_optimizer_safe_current"
     _attr_icon = "mdi:current-ac"
@@ -77,6 +79,7 @@ class EVMaxAvailableCurrentSensor(EVSmartChargerBaseSensor):
 
 class EVPriceStatusSensor(EVSmartChargerBaseSensor):
     """Sensor showing price logic status."""
+
     _attr_name = "Price Logic"
     _attr_unique_id = "ev_optimizer_price_logic"
     _attr_icon = "mdi:cash-clock"
@@ -87,6 +90,7 @@ class EVPriceStatusSensor(EVSmartChargerBaseSensor):
 
 class EVChargingPlanSensor(EVSmartChargerBaseSensor):
     """Sensor containing the calculated schedule."""
+
     _attr_name = "Charging Schedule"
     _attr_unique_id = "ev_optimizer_plan"
     _attr_icon = "mdi:calendar-clock"
@@ -102,12 +106,11 @@ class EVChargingPlanSensor(EVSmartChargerBaseSensor):
             return "Active Now"
             
         start = data.get("scheduled_start")
+        # The planner stores isoformat() output, so HH:MM is at a fixed offset
+        if isinstance(start, str) and len(start) >= 16 and start[10] in "T ":
+            return f"Next: {start[11:16]}"
         if start:
-            try:
-                dt = datetime.fromisoformat(start)
-                return f"Next: {dt.strftime('%H:%M')}"
-            except:
-                return start
+            return start
         
         return "No Charging Needed"
 
@@ -122,6 +125,7 @@ class EVChargingPlanSensor(EVSmartChargerBaseSensor):
 
 class EVSmartChargerLastSessionSensor(EVSmartChargerBaseSensor):
     """Sensor containing the report for the last finished session."""
+
     _attr_name = "Last Charging Session"
     _attr_unique_id = "ev_optimizer_last_session"
     _attr_icon = "mdi:history"
@@ -155,6 +159,7 @@ class EVSmartChargerLastSessionSensor(EVSmartChargerBaseSensor):
 
 class EVDebugDumpPathSensor(EVSmartChargerBaseSensor):
     """Sensor showing the path to the debug dump file."""
+
     _attr_name = "Debug Dump File"
     _attr_unique_id = "ev_optimizer_debug_dump_file"
     _attr_icon = "mdi:file-document"
@@ -190,7 +195,7 @@ class EVDebugDumpPathSensor(EVSmartChargerBaseSensor):
 
 class LearnedEfficiencySensor(CoordinatorEntity, SensorEntity):
     """Shows current learned charger efficiency."""
-    
+
     _attr_has_entity_name = False
     _attr_name = "Learned Charger Efficiency"
     _attr_unique_id = "ev_optimizer_learned_efficiency"
@@ -236,7 +241,7 @@ class LearnedEfficiencySensor(CoordinatorEntity, SensorEntity):
 
 class EfficiencyConfidenceSensor(CoordinatorEntity, SensorEntity):
     """Shows confidence level in learned efficiency."""
-    
+
     _attr_has_entity_name = False
     _attr_name = "Efficiency Learning Confidence"
     _attr_unique_id = "ev_optimizer_efficiency_confidence"
@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 import logging
+from array import array
+from collections import deque
 from datetime import datetime, timedelta
+from time import monotonic
 
 from .const import (
     DOMAIN,
@@ -12,29 +15,124 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Hard cap on retained log entries (on top of the 24h window)
+ACTION_LOG_MAX_ENTRIES = 2000
+
+# Newest log entries kept in a session report; a car left plugged in for days
+# would otherwise grow it without bound
+SESSION_LOG_MAX_ENTRIES = 500
+
+# Unchanged data points are skipped, but one is still recorded this often
+HISTORY_RESAMPLE_SECONDS = 15 * 60
+
+# Standard 3-phase 230V power per amp, maybe should be configurable (1 vs 3 phase)
+KW_PER_AMP_3PH = 3 * 230 / 1000.0
+
+
+class SessionHistory:
+    """Data points of the active session, stored column-wise.
+
+    Indexing or iterating yields the point dicts used by the report graph, so
+    a long session doesn't keep one dict per update alive.
+    """
+
+    __slots__ = (
+        "times", "monotonic", "soc", "amps", "charging", "price", "soc_sensor_refresh"
+    )
+
+    def __init__(self):
+        self.times: list[datetime] = []
+        # Monotonic clock per point, for interval lengths immune to clock changes
+        self.monotonic = array("d")
+        self.soc = array("d")
+        self.amps = array("d")
+        self.charging = array("b")
+        self.price = array("d")
+        self.soc_sensor_refresh = array("b")
+
+    def append(
+        self,
+        time: datetime,
+        mono: float,
+        soc: float,
+        amps: float,
+        charging: int,
+        price: float,
+        soc_sensor_refresh: bool,
+    ):
+        """Add a data point."""
+        self.times.append(time)
+        self.monotonic.append(mono)
+        self.soc.append(soc or 0.0)
+        self.amps.append(amps)
+        self.charging.append(charging)
+        self.price.append(price)
+        self.soc_sensor_refresh.append(bool(soc_sensor_refresh))
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, index: int) -> dict:
+        return {
+            "time": self.times[index].isoformat(),
+            "soc": self.soc[index],
+            "amps": self.amps[index],
+            "charging": self.charging[index],
+            "price": self.price[index],
+            "soc_sensor_refresh": bool(self.soc_sensor_refresh[index]),
+        }
+
+    def __iter__(self):
+        for index in range(len(self.times)):
+            yield self[index]
+
+
 class SessionManager:
     """Manages charging sessions, history, and action logging."""
 
     def __init__(self, hass):
         """Initialize the session manager."""
         self.hass = hass
-        self.action_log = []
+        # Newest first: (timestamp, formatted entry) pairs
+        self._action_log: deque[tuple[datetime, str]] = deque(maxlen=ACTION_LOG_MAX_ENTRIES)
+        self._action_log_snapshot: tuple[str, ...] | None = None
         self.current_session = None
         self.last_session_data = None
         self.overload_prevention_minutes = 0.0
         self._was_charging_in_interval = False
         self._last_log_message = None
         self._last_log_time = None
+        # (raw today prices, extra fee, VAT %, adjusted prices, slots per hour)
+        self._adjusted_price_cache: tuple = (None, None, None, [], 1)
+        self._reset_running_totals()
     
     def load_from_dict(self, data: dict):
         """Load persisted state."""
         if not data:
             return
-        self.action_log = data.get("action_log", [])
+        self._action_log.clear()
+        for entry in data.get("action_log", []):
+            try:
+                ts = datetime.fromisoformat(entry[1:20])
+            except (TypeError, ValueError):
+                continue
+            self._action_log.append((ts, entry))
+        self._action_log_snapshot = None
         self.last_session_data = data.get("last_session_data")
         # Don't persist overload_prevention_minutes - always start fresh at 0
         # It only applies to the current session and should reset on restart
 
+    @property
+    def action_log(self) -> tuple[str, ...]:
+        """Return the formatted log entries, newest first.
+
+        The tuple is cached and only rebuilt after the log changes, so every
+        coordinator update and sensor read shares the same object.
+        """
+        if self._action_log_snapshot is None:
+            self._action_log_snapshot = tuple(entry for _, entry in self._action_log)
+        return self._action_log_snapshot
+
     def to_dict(self) -> dict:
         """Return state for persistence."""
         return {
@@ -43,12 +141,13 @@ class SessionManager:
             # Don't persist overload_prevention_minutes - session-specific only
         }
 
-    def add_log(self, message: str):
+    def add_log(self, message: str, now: datetime | None = None):
         """Add an entry to the action log and prune entries older than 24h.
         
         Prevents duplicate messages within 5 minutes to reduce log spam.
         """
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         
         # Check if this is a duplicate of the last message within 5 minutes
         if (self._last_log_message == message and 
@@ -61,23 +160,15 @@ class SessionManager:
         self._last_log_message = message
         self._last_log_time = now
         
-        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
-        entry = f"[{timestamp}] {message}"
-        self.action_log.insert(0, entry)
+        # Same "YYYY-mm-dd HH:MM:SS" text as strftime, without parsing a format string
+        entry = f"[{now.isoformat(' ', 'seconds')}] {message}"
+        self._action_log.appendleft((now, entry))
 
         # Keep only last 24h events
         cutoff = now - timedelta(hours=24)
-        while self.action_log:
-            try:
-                last_entry = self.action_log[-1]
-                last_ts_str = last_entry[1:20]
-                last_dt = datetime.strptime(last_ts_str, "%Y-%m-%d %H:%M:%S")
-                if last_dt < cutoff:
-                    self.action_log.pop()
-                else:
-                    break
-            except (ValueError, IndexError):
-                self.action_log.pop()
+        while self._action_log and self._action_log[-1][0] < cutoff:
+            self._action_log.pop()
+        self._action_log_snapshot = None
 
         # Add to current session log if active
         if self.current_session is not None:
@@ -94,13 +185,19 @@ class SessionManager:
         self.add_log("Car plugged in. Session started.")
         self.current_session = {
             "start_time": datetime.now().isoformat(),
-            "history": [],
-            "log": [],
+            "history": SessionHistory(),
+            "log": deque(maxlen=SESSION_LOG_MAX_ENTRIES),
             "session_overload_minutes": 0.0,
         }
         # Reset overload prevention counter for new session
         # This tracks time lost to overload during the current plugged-in period
         self.overload_prevention_minutes = 0.0
+        self._reset_running_totals()
+
+    def _reset_running_totals(self):
+        """Clear the charged amp-hour accumulators kept by record_data_point."""
+        self._charged_ah = 0.0
+        self._charged_ah_cost = 0.0
 
     def stop_session(self, user_settings: dict, currency: str, final_soc: float = None):
         """Finalize the current session."""
@@ -117,44 +214,104 @@ class SessionManager:
         """Calculate current totals for an ACTIVE session without ending it."""
         return self._calculate_session_totals(currency, final_soc)
 
-    def record_data_point(self, data: dict, user_settings: dict, last_applied_amps: float, last_applied_state: str):
-        """Record a history data point for the active session."""
+    def record_data_point(
+        self,
+        data: dict,
+        user_settings: dict,
+        last_applied_amps: float,
+        last_applied_state: str,
+        now: datetime | None = None,
+    ):
+        """Record a history data point for the active session.
+
+        `now` is the wall-clock time of the update; it stamps the point and
+        picks the price slot. Interval lengths use the monotonic clock.
+        """
         if not self.current_session:
             return
 
-        now_ts = datetime.now()
-        current_price = 0.0
-        try:
-            raw_prices = data["price_data"].get("today", [])
-            if raw_prices:
-                count = len(raw_prices)
-                idx = (
-                    (now_ts.hour * 4) + (now_ts.minute // 15)
-                    if count > 25
-                    else now_ts.hour
-                )
-                idx = min(idx, count - 1)
-                current_price = float(raw_prices[idx])
-        except Exception:
-            current_price = 0.0
-
+        now_ts = now if now is not None else datetime.now()
         extra_fee = user_settings.get(ENTITY_PRICE_EXTRA_FEE, 0.0)
         vat_pct = user_settings.get(ENTITY_PRICE_VAT, 0.0)
-        adjusted_price = (current_price + extra_fee) * (1 + vat_pct / 100.0)
+        # Without a known spot price only the fee (with VAT) is recorded
+        adjusted_price = extra_fee * (1 + vat_pct / 100.0)
+        raw_prices = (data.get("price_data") or {}).get("today") or ()
+        if raw_prices:
+            adjusted_prices, slots_per_hour = self._adjusted_prices(
+                raw_prices, extra_fee, vat_pct
+            )
+            idx = now_ts.hour * slots_per_hour + now_ts.minute * slots_per_hour // 60
+            adjusted_price = adjusted_prices[min(idx, len(adjusted_prices) - 1)]
 
         is_charging = 1 if (last_applied_state == "charging" or self._was_charging_in_interval) else 0
-        point = {
-            "time": now_ts.isoformat(),
-            "soc": data.get("car_soc", 0),
-            "amps": last_applied_amps,
-            "charging": is_charging,
-            "price": adjusted_price,
-            "soc_sensor_refresh": data.get("soc_sensor_refresh", False),
-        }
+        soc = data.get("car_soc", 0)
+        soc_sensor_refresh = data.get("soc_sensor_refresh", False)
 
-        self.current_session["history"].append(point)
+        history = self.current_session["history"]
+        mono = monotonic()
+        if (
+            history
+            and not soc_sensor_refresh
+            and mono - history.monotonic[-1] < HISTORY_RESAMPLE_SECONDS
+            and history.soc[-1] == (soc or 0.0)
+            and history.amps[-1] == last_applied_amps
+            and history.charging[-1] == is_charging
+            and history.price[-1] == adjusted_price
+        ):
+            # Nothing changed since the last point (e.g. plugged in and idle).
+            # The interval keeps running from that point, so totals are the same.
+            self._was_charging_in_interval = False
+            return
+        if history:
+            # Add the interval that just ended, at the previous point's rate
+            amp_hours, cost = self._open_interval_amp_hours(history, mono)
+            self._charged_ah += amp_hours
+            self._charged_ah_cost += cost
+        history.append(
+            now_ts, mono, soc, last_applied_amps, is_charging, adjusted_price,
+            soc_sensor_refresh,
+        )
         self._was_charging_in_interval = False
 
+    @staticmethod
+    def _open_interval_amp_hours(history: SessionHistory, mono: float) -> tuple[float, float]:
+        """Return charged amp-hours and their cost since the last point."""
+        amps = history.amps[-1]
+        if not history.charging[-1] or amps <= 0:
+            return 0.0, 0.0
+        amp_hours = amps * (mono - history.monotonic[-1]) / 3600.0
+        return amp_hours, amp_hours * history.price[-1]
+
+    def _adjusted_prices(
+        self, raw_prices, extra_fee: float, vat_pct: float
+    ) -> tuple[list[float], int]:
+        """Return prices with fee and VAT applied and their slots per hour.
+
+        Reused until any input changes: the raw list is the price sensor's
+        attribute, so it stays the same object until the sensor updates.
+        Unparsable slots count as a 0.0 spot price.
+        """
+        cached_raw, cached_fee, cached_vat, adjusted, slots_per_hour = (
+            self._adjusted_price_cache
+        )
+        if raw_prices is cached_raw and extra_fee == cached_fee and vat_pct == cached_vat:
+            return adjusted, slots_per_hour
+
+        factor = 1 + vat_pct / 100.0
+        adjusted = []
+        for price in raw_prices:
+            try:
+                spot = float(price)
+            except (TypeError, ValueError):
+                spot = 0.0
+            adjusted.append((spot + extra_fee) * factor)
+        # More than 25 entries (DST days have 25 hours) means 15-minute prices
+        slots_per_hour = 4 if len(adjusted) > 25 else 1
+        self._adjusted_price_cache = (
+            raw_prices, extra_fee, vat_pct, adjusted, slots_per_hour
+        )
+        return adjusted, slots_per_hour
+
     def mark_charging_in_interval(self):
         """Mark that charging occurred during this interval (even if short)."""
         self._was_charging_in_interval = True
@@ -177,39 +334,12 @@ class SessionManager:
             
         start_soc = history[0]["soc"]
         end_soc = final_soc if final_soc is not None else history[-1]["soc"]
-        total_kwh = 0.0
-        total_cost = 0.0
-        
-        # Avoid crash if only 1 point
-        if len(history) < 2:
-            return {
-             "start_time": self.current_session["start_time"],
-             "end_time": datetime.now().isoformat(),
-             "start_soc": start_soc,
-             "end_soc": end_soc,
-             "added_kwh": 0.0,
-             "total_cost": 0.0,
-             "currency": currency,
-             "graph_data": history,
-             "session_log": self.current_session["log"],
-             "overload_prevention_minutes": self.current_session.get("session_overload_minutes", 0.0),
-            }
-
-        prev = datetime.fromisoformat(history[0]["time"])
-        for i in range(1, len(history)):
-            curr = datetime.fromisoformat(history[i]["time"])
-            delta_h = (curr - prev).total_seconds() / 3600.0
-            prev = curr
-            amps = history[i - 1]["amps"]
-            is_charging = history[i - 1]["charging"]
-            
-            if is_charging and amps > 0:
-                # Standard 3-phase calculation, maybe should be configurable (1 vs 3 phase)
-                power = (3 * 230 * amps) / 1000.0
-                kwh = power * delta_h
-                cost = kwh * history[i - 1]["price"]
-                total_kwh += kwh
-                total_cost += cost
+
+        # Unchanged ticks since the last point were skipped, but still count
+        # up to now at that point's rate
+        open_ah, open_cost = self._open_interval_amp_hours(history, monotonic())
+        total_kwh = (self._charged_ah + open_ah) * KW_PER_AMP_3PH
+        total_cost = (self._charged_ah_cost + open_cost) * KW_PER_AMP_3PH
 
         return {
             "start_time": self.current_session["start_time"],
@@ -219,7 +349,7 @@ class SessionManager:
             "added_kwh": round(total_kwh, 2),
             "total_cost": round(total_cost, 2),
             "currency": currency,
-            "graph_data": history,
-            "session_log": self.current_session["log"],
+            "graph_data": list(history),
+            "session_log": list(self.current_session["log"]),
             "overload_prevention_minutes": self.current_session.get("session_overload_minutes", 0.0),
         }
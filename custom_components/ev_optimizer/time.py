@@ -1,5 +1,7 @@
 """Time platform for EV Optimizer."""
 from datetime import time
+from functools import lru_cache
+from types import MappingProxyType
 from homeassistant.components.time import TimeEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -15,6 +17,33 @@ from .const import (
 )
 from .coordinator import EVSmartChargerCoordinator
 
+_DEFAULT_DEPARTURE = time(7, 0)
+_DEFAULT_ZERO = time(0, 0)
+_EMPTY = MappingProxyType({})
+
+
+@lru_cache(maxsize=256)
+def _parse_hhmm(value: str) -> time:
+    """Parse a persisted "HH:MM" or "HH:MM:SS" string into a time.
+
+    Seconds are ignored. Cached per distinct string.
+    """
+    hours, minutes = value.split(":", 2)[:2]
+    return time(int(hours), int(minutes))
+
+
+def _coerce_time(value) -> time | None:
+    """Return value as a time, parsing strings, or None if not possible."""
+    value_type = type(value)
+    if value_type is time:
+        return value
+    if value_type is str:
+        try:
+            return _parse_hhmm(value)
+        except ValueError:
+            return None
+    return None
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -29,168 +58,62 @@ async def async_setup_entry(
         EVDebugDepartureTime(coordinator),
     ])
 
-class EVDepartureTime(CoordinatorEntity, TimeEntity):
-    """Time entity for setting the standard daily departure time."""
+class EVTimeBase(CoordinatorEntity, TimeEntity):
+    """Base class for EV time entities backed by a coordinator data key."""
 
     _attr_has_entity_name = False
-    _attr_name = "Standard Departure Time"
-    _attr_unique_id = "ev_optimizer_departure_time"
-    _attr_icon = "mdi:clock-out"
-
-    def __init__(self, coordinator):
-        """Initialize the time entity."""
-        super().__init__(coordinator)
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return True
+    _key: str
+    _default: time = _DEFAULT_DEPARTURE
+    _fallback_key: str | None = None
+    # Plain class attribute shadows CoordinatorEntity.available so the settings
+    # stay editable even when a coordinator update fails.
+    available = True
 
     @property
     def native_value(self) -> time:
         """Return the current value from the coordinator data."""
-        if not self.coordinator.data:
-            return time(7, 0)
-        value = self.coordinator.data.get(ENTITY_DEPARTURE_TIME)
-        if value is None:
-            return time(7, 0)
-        # Convert string to time if needed
-        if isinstance(value, str):
-            try:
-                parts = value.split(":")
-                return time(int(parts[0]), int(parts[1]))
-            except:
-                return time(7, 0)
-        return value
+        data = self.coordinator.data or _EMPTY
+        value = _coerce_time(data.get(self._key))
+        if value is None and self._fallback_key:
+            value = _coerce_time(data.get(self._fallback_key))
+        return value if value is not None else self._default
 
     async def async_set_value(self, value: time) -> None:
         """Update the time."""
-        self.coordinator.set_user_input(ENTITY_DEPARTURE_TIME, value)
+        self.coordinator.set_user_input(self._key, value)
         # Coordinator refresh will update all entities
 
-class EVDepartureOverride(CoordinatorEntity, TimeEntity):
+class EVDepartureTime(EVTimeBase):
+    """Time entity for setting the standard daily departure time."""
+
+    _attr_name = "Standard Departure Time"
+    _attr_unique_id = "ev_optimizer_departure_time"
+    _attr_icon = "mdi:clock-out"
+    _key = ENTITY_DEPARTURE_TIME
+
+class EVDepartureOverride(EVTimeBase):
     """Time entity for overriding the next session's departure time."""
 
-    _attr_has_entity_name = False
     _attr_name = "Next Session Departure"
     _attr_unique_id = "ev_optimizer_departure_override"
     _attr_icon = "mdi:clock-fast"
+    _key = ENTITY_DEPARTURE_OVERRIDE
+    # Fall back to standard departure time
+    _fallback_key = ENTITY_DEPARTURE_TIME
 
-    def __init__(self, coordinator):
-        """Initialize the override entity."""
-        super().__init__(coordinator)
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return True
-
-    @property
-    def native_value(self) -> time:
-        """Return the current value from the coordinator data."""
-        if not self.coordinator.data:
-            return time(7, 0)
-        # Get override value
-        override = self.coordinator.data.get(ENTITY_DEPARTURE_OVERRIDE)
-        if override is not None:
-            # Convert string to time if needed
-            if isinstance(override, str):
-                try:
-                    parts = override.split(":")
-                    return time(int(parts[0]), int(parts[1]))
-                except:
-                    pass
-            elif isinstance(override, time):
-                return override
-        # Fall back to standard departure time
-        std_time = self.coordinator.data.get(ENTITY_DEPARTURE_TIME, time(7, 0))
-        if isinstance(std_time, str):
-            try:
-                parts = std_time.split(":")
-                return time(int(parts[0]), int(parts[1]))
-            except:
-                return time(7, 0)
-        return std_time if isinstance(std_time, time) else time(7, 0)
-
-    async def async_set_value(self, value: time) -> None:
-        """Update the override time."""
-        self.coordinator.set_user_input(ENTITY_DEPARTURE_OVERRIDE, value)
-        # Coordinator refresh will update all entities
-
-class EVDebugCurrentTime(CoordinatorEntity, TimeEntity):
+class EVDebugCurrentTime(EVTimeBase):
     """Debug entity for custom simulation - current time."""
 
-    _attr_has_entity_name = False
     _attr_name = "Debug: Current Time"
     _attr_unique_id = "ev_optimizer_debug_current_time"
     _attr_icon = "mdi:clock-start"
+    _key = ENTITY_DEBUG_CURRENT_TIME
+    _default = _DEFAULT_ZERO
 
-    def __init__(self, coordinator):
-        """Initialize the debug time entity."""
-        super().__init__(coordinator)
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return True
-
-    @property
-    def native_value(self) -> time | None:
-        """Return the current value from the coordinator data."""
-        if not self.coordinator.data:
-            return time(0, 0)
-        value = self.coordinator.data.get(ENTITY_DEBUG_CURRENT_TIME)
-        if value is None:
-            return time(0, 0)
-        # Convert string to time if needed
-        if isinstance(value, str):
-            try:
-                parts = value.split(":")
-                return time(int(parts[0]), int(parts[1]))
-            except:
-                return time(0, 0)
-        return value
-
-    async def async_set_value(self, value: time) -> None:
-        """Update the time."""
-        self.coordinator.set_user_input(ENTITY_DEBUG_CURRENT_TIME, value)
-        # Coordinator refresh will update all entities
-
-class EVDebugDepartureTime(CoordinatorEntity, TimeEntity):
+class EVDebugDepartureTime(EVTimeBase):
     """Debug entity for custom simulation - departure time."""
 
-    _attr_has_entity_name = False
     _attr_name = "Debug: Departure Time"
     _attr_unique_id = "ev_optimizer_debug_departure_time"
     _attr_icon = "mdi:clock-end"
-
-    def __init__(self, coordinator):
-        """Initialize the debug time entity."""
-        super().__init__(coordinator)
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return True
-
-    @property
-    def native_value(self) -> time | None:
-        """Return the current value from the coordinator data."""
-        if not self.coordinator.data:
-            return time(7, 0)
-        value = self.coordinator.data.get(ENTITY_DEBUG_DEPARTURE_TIME)
-        if value is None:
-            return time(7, 0)
-        # Convert string to time if needed
-        if isinstance(value, str):
-            try:
-                parts = value.split(":")
-                return time(int(parts[0]), int(parts[1]))
-            except:
-                return time(7, 0)
-        return value
-
-    async def async_set_value(self, value: time) -> None:
-        """Update the time."""
-        self.coordinator.set_user_input(ENTITY_DEBUG_DEPARTURE_TIME, value)
-        # Coordinator refresh will update all entities
\ No newline at end of file
+    _key = ENTITY_DEBUG_DEPARTURE_TIME
@@ -1,5 +1,7 @@
+import asyncio
 import importlib.util
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 from types import ModuleType
 
@@ -40,9 +42,22 @@ def _make_ha_stubs():
     def UpdateFailed(msg):
         return Exception(msg)
 
+    class CoordinatorEntity:
+        def __init__(self, coordinator):
+            self.coordinator = coordinator
+
     uh.DataUpdateCoordinator = DataUpdateCoordinator
+    uh.CoordinatorEntity = CoordinatorEntity
     uh.UpdateFailed = Exception
 
+    # Entity platform placeholders used by the platform modules
+    time_platform = ModuleType("homeassistant.components.time")
+    class TimeEntity: pass
+    time_platform.TimeEntity = TimeEntity
+
+    entity_platform = ModuleType("homeassistant.helpers.entity_platform")
+    entity_platform.AddEntitiesCallback = object
+
     # homeassistant.helpers.storage
     storage = ModuleType("homeassistant.helpers.storage")
 
@@ -84,16 +99,25 @@ def _make_ha_stubs():
         return datetime.now(timezone.utc)
     dt_module.now = now
     util_module.dt = dt_module
-    sys.modules["homeassistant.util"] = util_module
-    sys.modules["homeassistant.util.dt"] = dt_module
 
-    # Insert into sys.modules
-    sys.modules["homeassistant.const"] = const
-    sys.modules["homeassistant.helpers.update_coordinator"] = uh
-    sys.modules["homeassistant.helpers.storage"] = storage
-    sys.modules["homeassistant.helpers.event"] = event
-    sys.modules["homeassistant.config_entries"] = ce
-    sys.modules["homeassistant.core"] = core
+    return {
+        "homeassistant.util": util_module,
+        "homeassistant.util.dt": dt_module,
+        "homeassistant.const": const,
+        "homeassistant.helpers.update_coordinator": uh,
+        "homeassistant.helpers.storage": storage,
+        "homeassistant.helpers.event": event,
+        "homeassistant.helpers.entity_platform": entity_platform,
+        "homeassistant.components.time": time_platform,
+        "homeassistant.config_entries": ce,
+        "homeassistant.core": core,
+    }
+
+
+# Installed once at import, before test modules are collected, and never torn
+# down, so integration modules imported at module level stay cached
+HA_STUB_MODULES = _make_ha_stubs()
+sys.modules.update(HA_STUB_MODULES)
 
 
 def _load_pkg_module(full_name, rel_path):
@@ -105,13 +129,7 @@ def _load_pkg_module(full_name, rel_path):
     return mod
 
 
-@pytest.fixture(autouse=True)
-def ha_stubs():
-    _make_ha_stubs()
-    yield
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def pkg_loader():
     def _loader(name):
         base = Path(__file__).resolve().parents[1] / "custom_components" / "ev_optimizer"
@@ -141,11 +159,31 @@ def pkg_loader():
     return _loader
 
 
+@pytest.fixture(scope="session")
+def planner(pkg_loader):
+    # planner keeps no module-level state, so one load serves every test
+    return pkg_loader("planner")
+
+
+@pytest.fixture(scope="session")
+def const_mod(pkg_loader):
+    return pkg_loader("const")
+
+
+@pytest.fixture(scope="session")
+def coordinator_mod(pkg_loader):
+    # For tests that only construct coordinators; patch the module with monkeypatch
+    return pkg_loader("coordinator")
+
+
 class HassStates:
-    def __init__(self, states_dict):
+    def __init__(self, states_dict, state_factory=None):
         self._states = states_dict
+        self._state_factory = state_factory
 
     def get(self, entity_id):
+        if self._state_factory is not None:
+            return self._state_factory(entity_id)
         return self._states.get(entity_id)
 
 
@@ -158,12 +196,61 @@ class HassServices:
         return None
 
 
+class HassBus:
+    def async_fire(self, *args, **kwargs):
+        return None
+
+
+class HassConfig:
+    def path(self, *parts):
+        return "/tmp/" + "_".join(parts)
+
+
 class HassMock:
-    def __init__(self, states=None):
-        self.states = HassStates(states or {})
+    def __init__(self, states=None, state_factory=None):
+        self.states = HassStates(states or {}, state_factory)
         self.services = HassServices()
+        self.bus = HassBus()
+        self.config = HassConfig()
+        self.data = {}
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+    def async_create_task(self, coro):
+        return asyncio.create_task(coro)
+
+
+@dataclass(slots=True)
+class FakeEntry:
+    entry_id: str = "test"
+    data: dict = field(default_factory=dict)
+    options: dict = field(default_factory=dict)
 
 
 @pytest.fixture
 def hass_mock():
     return HassMock()
+
+
+@pytest.fixture(scope="session")
+def make_hass():
+    """Factory for a HassMock, e.g. with a state_factory answering every entity."""
+    return HassMock
+
+
+@pytest.fixture(scope="session")
+def make_entry(const_mod):
+    """Factory for a config entry with a typical charger setup plus overrides."""
+    def _make(overrides=None):
+        data = {
+            const_mod.CONF_MAX_FUSE: 20.0,
+            const_mod.CONF_CHARGER_LOSS: 10.0,
+            const_mod.CONF_CAR_CAPACITY: 64.0,
+            const_mod.CONF_CURRENCY: "SEK",
+            const_mod.CONF_PRICE_SENSOR: True,
+            **(overrides or {}),
+        }
+        return FakeEntry(data=data)
+
+    return _make
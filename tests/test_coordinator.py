@@ -1,7 +1,10 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from time import monotonic
 
+import pytest
 
-def test_fetch_sensor_data_reads_values(pkg_loader, hass_mock):
+
+def test_fetch_sensor_data_reads_values(pkg_loader, hass_mock, make_entry):
     const = pkg_loader("const")
     coordinator_mod = pkg_loader("coordinator")
 
@@ -20,22 +23,17 @@ def test_fetch_sensor_data_reads_values(pkg_loader, hass_mock):
     }.get(e)})()
 
     # Minimal entry stub
-    class Entry:
-        def __init__(self):
-            self.options = {}
-            self.data = {
-                const.CONF_P1_L1: "sensor.p1_l1",
-                const.CONF_P1_L2: "sensor.p1_l2",
-                const.CONF_P1_L3: "sensor.p1_l3",
-                const.CONF_ZAPTEC_LIMITER: "number.zap_limit",
-                const.CONF_CAR_SOC_SENSOR: "sensor.car_soc",
-                const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
-                const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
-                const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
-            }
-            self.entry_id = "test"
-
-    entry = Entry()
+    entry = make_entry({
+        const.CONF_P1_L1: "sensor.p1_l1",
+        const.CONF_P1_L2: "sensor.p1_l2",
+        const.CONF_P1_L3: "sensor.p1_l3",
+        const.CONF_ZAPTEC_LIMITER: "number.zap_limit",
+        const.CONF_CAR_SOC_SENSOR: "sensor.car_soc",
+        const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
+        const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
+        const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
+    })
+
     coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry)
 
     data = coord._fetch_sensor_data()
@@ -47,7 +45,7 @@ def test_fetch_sensor_data_reads_values(pkg_loader, hass_mock):
     assert data["car_soc"] == 40.0
 
 
-def test_fetch_sensor_data_handles_unavailable(pkg_loader, hass_mock):
+def test_fetch_sensor_data_handles_unavailable(pkg_loader, hass_mock, make_entry):
     coordinator_mod = pkg_loader("coordinator")
     const = pkg_loader("const")
 
@@ -58,22 +56,17 @@ def test_fetch_sensor_data_handles_unavailable(pkg_loader, hass_mock):
     # Return None or unavailable
     hass_mock.states = type("S", (), {"get": lambda self, e: None})()
 
-    class Entry:
-        def __init__(self):
-            self.options = {}
-            self.data = {
-                const.CONF_P1_L1: None,
-                const.CONF_P1_L2: None,
-                const.CONF_P1_L3: None,
-                const.CONF_ZAPTEC_LIMITER: None,
-                const.CONF_CAR_SOC_SENSOR: None,
-                const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
-                const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
-                const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
-            }
-            self.entry_id = "test"
-
-    entry = Entry()
+    entry = make_entry({
+        const.CONF_P1_L1: None,
+        const.CONF_P1_L2: None,
+        const.CONF_P1_L3: None,
+        const.CONF_ZAPTEC_LIMITER: None,
+        const.CONF_CAR_SOC_SENSOR: None,
+        const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
+        const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
+        const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
+    })
+
     coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry)
     data = coord._fetch_sensor_data()
 
@@ -82,7 +75,37 @@ def test_fetch_sensor_data_handles_unavailable(pkg_loader, hass_mock):
     assert data.get("zap_limit_value", 0.0) == 0.0
 
 
-def test_virtual_soc_resyncs_down_when_paused(pkg_loader, hass_mock):
+def test_fetch_sensor_data_reuses_parsed_value_until_state_changes(pkg_loader, hass_mock, make_entry):
+    coordinator_mod = pkg_loader("coordinator")
+    const = pkg_loader("const")
+
+    class State:
+        def __init__(self, state, last_updated):
+            self.state = state
+            self.last_updated = last_updated
+            self.attributes = {}
+
+    t0 = datetime(2026, 1, 1, 12, 0, 0)
+    states = {"sensor.p1_l1": State("5.0", t0)}
+    hass_mock.states = type("S", (), {"get": lambda self, e: states.get(e)})()
+
+    entry = make_entry({
+        const.CONF_P1_L1: "sensor.p1_l1",
+        const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
+        const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
+        const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
+    })
+    coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry)
+
+    assert coord._fetch_sensor_data()["p1_l1"] == 5.0
+    assert coord._state_float_cache["sensor.p1_l1"] == (t0, 5.0)
+
+    # A new state object (new last_updated) is parsed again
+    states["sensor.p1_l1"] = State("7.5", datetime(2026, 1, 1, 12, 0, 5))
+    assert coord._fetch_sensor_data()["p1_l1"] == 7.5
+
+
+def test_virtual_soc_resyncs_down_when_paused(pkg_loader, hass_mock, make_entry):
     coordinator_mod = pkg_loader("coordinator")
     const = pkg_loader("const")
 
@@ -101,26 +124,22 @@ def test_virtual_soc_resyncs_down_when_paused(pkg_loader, hass_mock):
         },
     )()
 
-    class Entry:
-        def __init__(self):
-            self.options = {}
-            self.data = {
-                const.CONF_CAR_SOC_SENSOR: "sensor.car_soc",
-                const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
-                const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
-                const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
-            }
-            self.entry_id = "test"
-
-    coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, Entry())
+    entry = make_entry({
+        const.CONF_CAR_SOC_SENSOR: "sensor.car_soc",
+        const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
+        const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
+        const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
+    })
+
+    coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry)
     coord._virtual_soc = 82.0
-    coord._last_applied_state = "paused"
+    coord._charger_state.applied_state = "paused"
 
     coord._update_virtual_soc({"car_soc": 58.0})
     assert coord._virtual_soc == 58.0
 
 
-def test_virtual_soc_resyncs_down_on_significant_drop_while_charging(pkg_loader, hass_mock):
+def test_virtual_soc_resyncs_down_on_significant_drop_while_charging(pkg_loader, hass_mock, make_entry):
     """During active charging, ignore lower sensor values (they may be stale).
     Only trust them during force refresh period or when not charging."""
     coordinator_mod = pkg_loader("coordinator")
@@ -141,105 +160,75 @@ def test_virtual_soc_resyncs_down_on_significant_drop_while_charging(pkg_loader,
         },
     )()
 
-    class Entry:
-        def __init__(self):
-            self.options = {}
-            self.data = {
-                const.CONF_CAR_SOC_SENSOR: "sensor.car_soc",
-                const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
-                const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
-                const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
-            }
-            self.entry_id = "test"
-
-    coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, Entry())
+    entry = make_entry({
+        const.CONF_CAR_SOC_SENSOR: "sensor.car_soc",
+        const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
+        const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
+        const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
+    })
+
+    coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry)
     coord._virtual_soc = 82.0
-    coord._last_applied_state = "charging"
+    coord._charger_state.applied_state = "charging"
 
     # Ensure the estimator portion doesn't add energy in this unit test.
-    coord._last_applied_amps = -1
+    coord._charger_state.applied_amps = -1
 
     coord._update_virtual_soc({"car_soc": 58.0, "ch_l1": 0.0, "ch_l2": 0.0, "ch_l3": 0.0})
     # During active charging, ignore lower sensor values (they may be stale)
     assert coord._virtual_soc == 82.0
 
 
-def test_trigger_report_generation_uses_session_manager(pkg_loader, hass_mock):
+def test_trigger_report_generation_uses_session_manager(pkg_loader, hass_mock, make_entry):
     coordinator_mod = pkg_loader("coordinator")
     const = pkg_loader("const")
 
-    class Entry:
-        def __init__(self):
-            self.options = {}
-            self.data = {
-                const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
-                const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
-                const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
-                const.CONF_CAR_SOC_SENSOR: None,
-            }
-            self.entry_id = "test"
-
-    coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, Entry())
-
-    # Stub event bus used by SessionManager logging
-    hass_mock.bus = type("B", (), {"async_fire": lambda self, *args, **kwargs: None})()
+    entry = make_entry({
+        const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
+        const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
+        const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
+        const.CONF_CAR_SOC_SENSOR: None,
+    })
 
-    # Minimal hass config stub for path building and executor job
-    hass_mock.config = type("C", (), {"path": lambda self, *p: "/tmp/" + "/".join(p)})()
-
-    async def _executor_job(fn, *args, **kwargs):
-        return fn(*args, **kwargs)
-
-    hass_mock.async_add_executor_job = _executor_job
+    coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry)
 
     # Fake an active session with a single point (should still produce a dict)
-    coord.session_manager.current_session = {
-        "start_time": "2025-01-01T00:00:00",
-        "history": [{"time": "2025-01-01T00:00:00", "soc": 40, "amps": 0, "charging": 0, "price": 0}],
-        "log": [],
-    }
+    coord.session_manager.start_session(40.0)
+    coord.session_manager.record_data_point({"car_soc": 40}, {}, 0, "paused")
 
     # Should not raise (this used to crash looking for coord.current_session)
     import asyncio
     asyncio.get_event_loop().run_until_complete(coord.async_trigger_report_generation())
 
 
-def test_virtual_soc_ignores_wobble_during_charging(pkg_loader, hass_mock):
+def test_virtual_soc_ignores_wobble_during_charging(pkg_loader, hass_mock, make_entry):
     """Test that virtual SoC doesn't wobble from stale sensor updates during charging."""
-    from datetime import timedelta
-    
     const = pkg_loader("const")
     coordinator_mod = pkg_loader("coordinator")
     
     # Setup coordinator with all required config fields
-    entry_mock = type("E", (), {
-        "entry_id": "test123",
-        "data": {
-            "car_soc": "sensor.car_soc",
-            "car_plugged": "binary_sensor.car_plugged",
-            "price": "sensor.electricity_price",
-            "charger_amps": "number.charger_amps",
-            "ch_l1": "sensor.charger_l1",
-            "ch_l2": "sensor.charger_l2",
-            "ch_l3": "sensor.charger_l3",
-            const.CONF_CAR_CAPACITY: 75.0,
-            const.CONF_CHARGER_LOSS: 10.0,
-            const.CONF_MAX_FUSE: 25.0,
-            const.CONF_PRICE_SENSOR: True,
-            const.CONF_CURRENCY: "SEK",
-        },
-        "options": {},
-    })()
+    entry_mock = make_entry({
+        "car_soc": "sensor.car_soc",
+        "car_plugged": "binary_sensor.car_plugged",
+        "price": "sensor.electricity_price",
+        "charger_amps": "number.charger_amps",
+        "ch_l1": "sensor.charger_l1",
+        "ch_l2": "sensor.charger_l2",
+        "ch_l3": "sensor.charger_l3",
+        const.CONF_CAR_CAPACITY: 75.0,
+        const.CONF_CHARGER_LOSS: 10.0,
+        const.CONF_MAX_FUSE: 25.0,
+    })
     
     coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry_mock)
     coord._data_loaded = True
-    coord._startup_time = datetime.now() - timedelta(minutes=10)
+    coord._startup_monotonic = float("-inf")  # skip startup grace period
     
     # Initialize: actively charging, virtual SoC at 65%
     coord._virtual_soc = 65.0
-    coord._last_applied_state = "charging"
-    coord._last_applied_amps = 16.0
-    coord._last_update_time = datetime.now() - timedelta(seconds=30)
+    coord._charger_state.applied_state = "charging"
+    coord._charger_state.applied_amps = 16.0
+    coord._last_update_monotonic = monotonic() - 30
     coord._refresh_trigger_timestamp = None
     coord._soc_before_refresh = 65.0
     coord.car_capacity = 75.0
@@ -271,7 +260,7 @@ def test_virtual_soc_ignores_wobble_during_charging(pkg_loader, hass_mock):
     current_virtual = coord._virtual_soc
     hass_mock.states = type("S", (), {"get": lambda self, e: State("66.0")})()
     data["car_soc"] = 66.0
-    coord._last_update_time = datetime.now() - timedelta(seconds=30)
+    coord._last_update_monotonic = monotonic() - 30
     
     trust_sensor = coord._update_virtual_soc(data)
     
@@ -280,41 +269,33 @@ def test_virtual_soc_ignores_wobble_during_charging(pkg_loader, hass_mock):
     assert coord._virtual_soc != 66.0, "Virtual SoC should NOT jump to sensor (prevents wobbling)"
 
 
-def test_virtual_soc_accepts_sensor_during_forced_refresh(pkg_loader, hass_mock):
+def test_virtual_soc_accepts_sensor_during_forced_refresh(pkg_loader, hass_mock, make_entry):
     """Test that virtual SoC accepts sensor updates during forced refresh window."""
-    from datetime import timedelta
-    
     const = pkg_loader("const")
     coordinator_mod = pkg_loader("coordinator")
     
-    entry_mock = type("E", (), {
-        "entry_id": "test123",
-        "data": {
-            "car_soc": "sensor.car_soc",
-            "car_plugged": "binary_sensor.car_plugged",
-            "price": "sensor.electricity_price",
-            "charger_amps": "number.charger_amps",
-            "ch_l1": "sensor.charger_l1",
-            "ch_l2": "sensor.charger_l2",
-            "ch_l3": "sensor.charger_l3",
-            const.CONF_CAR_CAPACITY: 75.0,
-            const.CONF_CHARGER_LOSS: 10.0,
-            const.CONF_MAX_FUSE: 25.0,
-            const.CONF_PRICE_SENSOR: True,
-            const.CONF_CURRENCY: "SEK",
-        },
-        "options": {},
-    })()
+    entry_mock = make_entry({
+        "car_soc": "sensor.car_soc",
+        "car_plugged": "binary_sensor.car_plugged",
+        "price": "sensor.electricity_price",
+        "charger_amps": "number.charger_amps",
+        "ch_l1": "sensor.charger_l1",
+        "ch_l2": "sensor.charger_l2",
+        "ch_l3": "sensor.charger_l3",
+        const.CONF_CAR_CAPACITY: 75.0,
+        const.CONF_CHARGER_LOSS: 10.0,
+        const.CONF_MAX_FUSE: 25.0,
+    })
     
     coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry_mock)
     coord._data_loaded = True
-    coord._startup_time = datetime.now() - timedelta(minutes=10)
+    coord._startup_monotonic = float("-inf")  # skip startup grace period
     
     # Actively charging with forced refresh active
     coord._virtual_soc = 65.0
-    coord._last_applied_state = "charging"
-    coord._last_applied_amps = 16.0
-    coord._last_update_time = datetime.now() - timedelta(seconds=30)
+    coord._charger_state.applied_state = "charging"
+    coord._charger_state.applied_amps = 16.0
+    coord._last_update_monotonic = monotonic() - 30
     coord._soc_before_refresh = 65.0
     coord._refresh_trigger_timestamp = datetime.now() - timedelta(minutes=1)
     coord.car_capacity = 75.0
@@ -342,40 +323,32 @@ def test_virtual_soc_accepts_sensor_during_forced_refresh(pkg_loader, hass_mock)
     assert coord._virtual_soc < 69.0, "Should only add small increment from 30s of charging"
 
 
-def test_virtual_soc_trusts_sensor_when_not_charging(pkg_loader, hass_mock):
+def test_virtual_soc_trusts_sensor_when_not_charging(pkg_loader, hass_mock, make_entry):
     """Test that virtual SoC always trusts sensor when not actively charging."""
-    from datetime import timedelta
-    
     const = pkg_loader("const")
     coordinator_mod = pkg_loader("coordinator")
     
-    entry_mock = type("E", (), {
-        "entry_id": "test123",
-        "data": {
-            "car_soc": "sensor.car_soc",
-            "car_plugged": "binary_sensor.car_plugged",
-            "price": "sensor.electricity_price",
-            "charger_amps": "number.charger_amps",
-            "ch_l1": "sensor.charger_l1",
-            "ch_l2": "sensor.charger_l2",
-            "ch_l3": "sensor.charger_l3",
-            const.CONF_CAR_CAPACITY: 75.0,
-            const.CONF_CHARGER_LOSS: 10.0,
-            const.CONF_MAX_FUSE: 25.0,
-            const.CONF_PRICE_SENSOR: True,
-            const.CONF_CURRENCY: "SEK",
-        },
-        "options": {},
-    })()
+    entry_mock = make_entry({
+        "car_soc": "sensor.car_soc",
+        "car_plugged": "binary_sensor.car_plugged",
+        "price": "sensor.electricity_price",
+        "charger_amps": "number.charger_amps",
+        "ch_l1": "sensor.charger_l1",
+        "ch_l2": "sensor.charger_l2",
+        "ch_l3": "sensor.charger_l3",
+        const.CONF_CAR_CAPACITY: 75.0,
+        const.CONF_CHARGER_LOSS: 10.0,
+        const.CONF_MAX_FUSE: 25.0,
+    })
     
     coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry_mock)
     coord._data_loaded = True
-    coord._startup_time = datetime.now() - timedelta(minutes=10)
+    coord._startup_monotonic = float("-inf")  # skip startup grace period
     
     # Not charging, virtual SoC higher than sensor (car was driven)
     coord._virtual_soc = 80.0
-    coord._last_applied_state = "paused"
-    coord._last_update_time = datetime.now() - timedelta(seconds=30)
+    coord._charger_state.applied_state = "paused"
+    coord._last_update_monotonic = monotonic() - 30
     coord._refresh_trigger_timestamp = None
     coord.car_capacity = 75.0
     
@@ -403,9 +376,8 @@ def test_virtual_soc_trusts_sensor_when_not_charging(pkg_loader, hass_mock):
 # Regression tests for the two May 2026 charging failures.
 # ---------------------------------------------------------------------------
 
-def _make_coordinator_for_regression(pkg_loader, hass_mock):
+def _make_coordinator_for_regression(pkg_loader, hass_mock, make_entry):
     """Helper: create a minimal coordinator suitable for regression testing."""
-    from datetime import timedelta
     const = pkg_loader("const")
     coordinator_mod = pkg_loader("coordinator")
 
@@ -417,25 +389,21 @@ def _make_coordinator_for_regression(pkg_loader, hass_mock):
         "get": lambda self, e: State("0") if e else None
     })()
 
-    entry = type("E", (), {
-        "entry_id": "regression",
-        "data": {
-            const.CONF_CAR_SOC_SENSOR: "sensor.car_soc",
-            const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
-            const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
-            const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
-        },
-        "options": {},
-    })()
+    entry = make_entry({
+        const.CONF_CAR_SOC_SENSOR: "sensor.car_soc",
+        const.CONF_MAX_FUSE: const.DEFAULT_MAX_FUSE,
+        const.CONF_CHARGER_LOSS: const.DEFAULT_LOSS,
+        const.CONF_CAR_CAPACITY: const.DEFAULT_CAPACITY,
+    })
 
     coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry)
-    coord._startup_time = datetime.now() - timedelta(minutes=10)
-    coord._last_update_time = datetime.now() - timedelta(seconds=30)
+    coord._startup_monotonic = float("-inf")  # skip startup grace period
+    coord._last_update_monotonic = monotonic() - 30
     coord.car_capacity = const.DEFAULT_CAPACITY
     return coord
 
 
-def test_sensor_soc_update_detected_on_large_drop(pkg_loader, hass_mock):
+def test_sensor_soc_update_detected_on_large_drop(pkg_loader, hass_mock, make_entry):
     """Regression test for Bug 2 (May 17-18 2026).
 
     When the SoC sensor drops from 85% → 41% (BMS recalibration) while the
@@ -446,10 +414,10 @@ def test_sensor_soc_update_detected_on_large_drop(pkg_loader, hass_mock):
     the ALREADY-UPDATED data["car_soc"] (which equals virtual_soc), giving a
     diff of 0 — so the plan was never unlocked.
     """
-    coord = _make_coordinator_for_regression(pkg_loader, hass_mock)
+    coord = _make_coordinator_for_regression(pkg_loader, hass_mock, make_entry)
 
     # Simulate state: car in maintenance mode, sensor was last read at 85%
-    coord._last_applied_state = "maintenance"
+    coord._charger_state.applied_state = "maintenance"
     coord._virtual_soc = 85.0
     coord._last_sensor_soc = 85.0
 
@@ -468,7 +436,7 @@ def test_sensor_soc_update_detected_on_large_drop(pkg_loader, hass_mock):
     )
 
 
-def test_sensor_soc_update_detected_on_soc_rise_during_charging(pkg_loader, hass_mock):
+def test_sensor_soc_update_detected_on_soc_rise_during_charging(pkg_loader, hass_mock, make_entry):
     """Regression test for Bug 1 (May 15-16 2026).
 
     After a charging slot expires the plan needs to regenerate to pick the next
@@ -478,9 +446,9 @@ def test_sensor_soc_update_detected_on_soc_rise_during_charging(pkg_loader, hass
     before the coordinator compared it, so the diff was always 0 and the plan
     stayed locked with no more slots.
     """
-    coord = _make_coordinator_for_regression(pkg_loader, hass_mock)
+    coord = _make_coordinator_for_regression(pkg_loader, hass_mock, make_entry)
 
-    coord._last_applied_state = "charging"
+    coord._charger_state.applied_state = "charging"
     coord._virtual_soc = 87.0
     coord._last_sensor_soc = 87.0
 
@@ -497,7 +465,7 @@ def test_sensor_soc_update_detected_on_soc_rise_during_charging(pkg_loader, hass
     )
 
 
-def test_maintenance_lock_cleared_when_soc_below_target(pkg_loader, hass_mock):
+def test_maintenance_lock_cleared_when_soc_below_target(pkg_loader, hass_mock, make_entry):
     """Regression test for Bug 2 safety net.
 
     Even if sensor_soc_updated isn't detected (e.g., sensor didn't change since
@@ -506,7 +474,7 @@ def test_maintenance_lock_cleared_when_soc_below_target(pkg_loader, hass_mock):
     This prevents the car sitting at 41% all night while the summary still says
     'Target reached (80%)'.
     """
-    coord = _make_coordinator_for_regression(pkg_loader, hass_mock)
+    coord = _make_coordinator_for_regression(pkg_loader, hass_mock, make_entry)
 
     # Locked plan: maintenance mode thinks target is reached
     coord._locked_plan = {
@@ -532,3 +500,67 @@ def test_maintenance_lock_cleared_when_soc_below_target(pkg_loader, hass_mock):
         f"virtual_soc ({coord._virtual_soc}%) is > 5% below target ({locked_target}%)"
     )
 
+
+
+def test_plan_image_not_rerendered_when_content_unchanged(pkg_loader, hass_mock, tmp_path, monkeypatch, make_entry):
+    import asyncio
+
+    coordinator_mod = pkg_loader("coordinator")
+
+    entry = make_entry()
+
+    renders = []
+
+    def fake_render(data, path):
+        renders.append(data)
+        open(path, "w").close()
+
+    hass_mock.config = type("C", (), {"path": lambda self, *p: str(tmp_path.joinpath(*p))})()
+    (tmp_path / "www").mkdir()
+
+    coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry)
+    monkeypatch.setattr(coordinator_mod, "generate_plan_image", fake_render)
+    coord.data = {
+        "charging_schedule": [{"start": "2026-01-01T00:00:00", "active": True}],
+        "planned_target_soc": 80,
+        "latency_ms": 1.0,
+    }
+
+    asyncio.run(coord.async_trigger_plan_image_generation())
+    # Fields the image does not show don't force a new render
+    coord.data = {**coord.data, "latency_ms": 2.0}
+    asyncio.run(coord.async_trigger_plan_image_generation())
+    assert len(renders) == 1
+
+    coord.data = {**coord.data, "planned_target_soc": 90}
+    asyncio.run(coord.async_trigger_plan_image_generation())
+    assert len(renders) == 2
+
+
+@pytest.mark.parametrize(
+    ("data_loss", "options_loss", "expected_loss"),
+    [
+        (10.0, None, 10.0),  # entry.data only
+        (10.0, 5.0, 5.0),  # options override data
+        (None, None, 0.0),  # not configured: DEFAULT_LOSS
+    ],
+    ids=["data_only", "options_override", "missing"],
+)
+def test_charger_loss_sets_virtual_soc_factor(
+    const_mod, coordinator_mod, hass_mock, make_entry, data_loss, options_loss, expected_loss
+):
+    entry = make_entry()
+    if data_loss is None:
+        del entry.data[const_mod.CONF_CHARGER_LOSS]
+    else:
+        entry.data[const_mod.CONF_CHARGER_LOSS] = data_loss
+    if options_loss is not None:
+        entry.options[const_mod.CONF_CHARGER_LOSS] = options_loss
+
+    coord = coordinator_mod.EVSmartChargerCoordinator(hass_mock, entry)
+
+    assert const_mod.DEFAULT_LOSS == 0.0
+    assert coord._charger_loss_pct == expected_loss
+    assert coord.config_settings["charger_loss"] == expected_loss
+    # 3x230V = 0.69 kW per amp, reduced by the loss
+    assert coord._kw_per_amp_eff == pytest.approx(0.69 * (1 - expected_loss / 100.0))
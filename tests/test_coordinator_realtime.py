@@ -89,6 +89,7 @@ def test_update_callback_triggers_refresh(pkg_loader, mock_hass):
 
     with patch.object(coordinator_mod, "async_track_state_change_event"):
         coordinator = coordinator_mod.EVSmartChargerCoordinator(mock_hass, entry)
+        coordinator.previous_plugged_state = True
         coordinator.async_request_refresh = MagicMock()
         
         # Simulate callback
@@ -164,6 +165,7 @@ def test_update_callback_debounces(pkg_loader, mock_hass):
 
     with patch.object(coordinator_mod, "async_track_state_change_event"):
         coordinator = coordinator_mod.EVSmartChargerCoordinator(mock_hass, entry)
+        coordinator.previous_plugged_state = True
         coordinator.async_request_refresh = MagicMock()
         
         # First call
@@ -191,3 +193,128 @@ def test_update_callback_debounces(pkg_loader, mock_hass):
             callback()
             
             coordinator.async_request_refresh.assert_called_once()
+
+
+def test_update_interval_backs_off_while_unplugged(pkg_loader, mock_hass):
+    const = pkg_loader("const")
+    coordinator_mod = pkg_loader("coordinator")
+
+    entry = MagicMock()
+    entry.entry_id = "test"
+    entry.data = {
+        const.CONF_MAX_FUSE: 20,
+        const.CONF_CHARGER_LOSS: 10,
+        const.CONF_CAR_CAPACITY: 60,
+        const.CONF_CAR_PLUGGED_SENSOR: "binary_sensor.plugged",
+    }
+    entry.options = {}
+
+    with patch.object(coordinator_mod, "async_track_state_change_event") as mock_track:
+        coordinator = coordinator_mod.EVSmartChargerCoordinator(mock_hass, entry)
+        assert coordinator.update_interval == coordinator_mod.UPDATE_INTERVAL_PLUGGED
+
+        # Plug/unplug events must still refresh immediately
+        coordinator.async_setup_listeners()
+        args, _ = mock_track.call_args
+        assert args[1] == ["binary_sensor.plugged"]
+        assert args[2] == coordinator._async_plugged_update_callback
+
+    coordinator._adjust_update_interval(False)
+    assert coordinator.update_interval == coordinator_mod.UPDATE_INTERVAL_UNPLUGGED
+
+    coordinator._adjust_update_interval(True)
+    assert coordinator.update_interval == coordinator_mod.UPDATE_INTERVAL_PLUGGED
+
+
+def test_p1_callback_ignored_while_unplugged(pkg_loader, mock_hass):
+    const = pkg_loader("const")
+    coordinator_mod = pkg_loader("coordinator")
+
+    entry = MagicMock()
+    entry.entry_id = "test"
+    entry.data = {
+        const.CONF_P1_L1: "sensor.p1",
+        const.CONF_P1_L2: "sensor.p2",
+        const.CONF_P1_L3: "sensor.p3",
+        const.CONF_MAX_FUSE: 20,
+        const.CONF_CHARGER_LOSS: 10,
+        const.CONF_CAR_CAPACITY: 60,
+    }
+    entry.options = {}
+
+    with patch.object(coordinator_mod, "async_track_state_change_event"):
+        coordinator = coordinator_mod.EVSmartChargerCoordinator(mock_hass, entry)
+        coordinator.async_request_refresh = MagicMock()
+        coordinator.previous_plugged_state = False
+
+        coordinator._async_p1_update_callback(None)
+
+        coordinator.async_request_refresh.assert_not_called()
+        mock_hass.loop.call_later.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_calendar_events_cached_between_updates(pkg_loader, mock_hass):
+    """calendar.get_events is only called again once the cache expires or departure changes."""
+    from unittest.mock import AsyncMock
+
+    const = pkg_loader("const")
+    coordinator_mod = pkg_loader("coordinator")
+
+    entry = MagicMock()
+    entry.entry_id = "cal_test"
+    entry.data = {
+        const.CONF_MAX_FUSE: 25.0,
+        const.CONF_CHARGER_LOSS: 8.0,
+        const.CONF_CAR_CAPACITY: 75.0,
+        const.CONF_CALENDAR_ENTITY: "calendar.car",
+    }
+    entry.options = {}
+
+    events = [{"start": "2099-01-01T07:00:00", "summary": "Trip 90%"}]
+    mock_hass.services.async_call = AsyncMock(
+        return_value={"calendar.car": {"events": events}}
+    )
+
+    with patch.object(coordinator_mod, "async_track_state_change_event"):
+        coordinator = coordinator_mod.EVSmartChargerCoordinator(mock_hass, entry)
+        coordinator._data_loaded = True
+
+        data = await coordinator._async_update_data()
+        assert data["calendar_events"] == events
+        await coordinator._async_update_data()
+        assert mock_hass.services.async_call.await_count == 1
+
+        # Changing the departure time invalidates the cache
+        coordinator.set_user_input(const.ENTITY_DEPARTURE_TIME, "08:00", internal=True)
+        await coordinator._async_update_data()
+        assert mock_hass.services.async_call.await_count == 2
+
+
+def test_unchanged_user_input_is_not_saved(pkg_loader, mock_hass):
+    const = pkg_loader("const")
+    coordinator_mod = pkg_loader("coordinator")
+
+    entry = MagicMock()
+    entry.entry_id = "test"
+    entry.data = {
+        const.CONF_MAX_FUSE: 20,
+        const.CONF_CHARGER_LOSS: 10,
+        const.CONF_CAR_CAPACITY: 60,
+    }
+    entry.options = {}
+
+    with patch.object(coordinator_mod, "async_track_state_change_event"):
+        coordinator = coordinator_mod.EVSmartChargerCoordinator(mock_hass, entry)
+    coordinator.data = {"car_plugged": True}
+    coordinator._save_data = MagicMock()
+
+    coordinator.set_user_input(const.ENTITY_TARGET_SOC, 85)
+    coordinator.set_user_input(const.ENTITY_MIN_SOC, 30)
+    assert coordinator._save_data.call_count == 2
+    # Both changes share one debounced refresh
+    mock_hass.loop.call_later.assert_called_once()
+
+    coordinator._save_data.reset_mock()
+    coordinator.set_user_input(const.ENTITY_TARGET_SOC, 85)
+    coordinator._save_data.assert_not_called()
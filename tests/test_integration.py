@@ -84,8 +84,12 @@ async def test_full_charging_cycle(pkg_loader, mock_hass):
     # Patch with string paths to capture module-level datetime imports
     with patch("custom_components.ev_optimizer.coordinator.async_track_state_change_event"), \
          patch("custom_components.ev_optimizer.coordinator.datetime") as mock_dt_coord, \
+         patch("custom_components.ev_optimizer.coordinator.monotonic") as mock_monotonic, \
          patch("custom_components.ev_optimizer.planner.datetime") as mock_dt_plan:
 
+        # Elapsed-time checks follow the simulated wall clock
+        mock_monotonic.side_effect = lambda: mock_dt_coord.now.return_value.timestamp()
+
         # Sync all mock datetime objects
         for mock_dt in [mock_dt_coord, mock_dt_plan]:
             mock_dt.fromisoformat = datetime.fromisoformat
@@ -113,7 +117,7 @@ async def test_full_charging_cycle(pkg_loader, mock_hass):
         await coordinator._async_update_data()
         
         assert coordinator.session_manager.current_session is not None
-        assert coordinator._last_applied_state != "charging"
+        assert coordinator._charger_state.applied_state != "charging"
         
         # -----------------------------------------------------------------
         # PHASE 2: CHARGING START (02:00 - Next Day)
@@ -124,9 +128,9 @@ async def test_full_charging_cycle(pkg_loader, mock_hass):
         
         data = await coordinator._async_update_data()
         
-        assert coordinator._last_applied_state == "charging", "Should be charging at 02:00"
+        assert coordinator._charger_state.applied_state == "charging", "Should be charging at 02:00"
         # Expect 15A because: Max Fuse 16A - Buffer 1A (min buffer) = 15A Available.
-        assert coordinator._last_applied_amps == 15.0 
+        assert coordinator._charger_state.applied_amps == 15.0 
         
         # -----------------------------------------------------------------
         # PHASE 3: LOAD BALANCING (02:15)
@@ -137,9 +141,9 @@ async def test_full_charging_cycle(pkg_loader, mock_hass):
         await coordinator._async_update_data()
         
         # 16A Fuse - 8A Load - 1A Buffer = 7A Available
-        assert coordinator._last_applied_state == "charging"
-        assert coordinator._last_applied_amps <= 7.0 
-        assert coordinator._last_applied_amps >= 6.0 
+        assert coordinator._charger_state.applied_state == "charging"
+        assert coordinator._charger_state.applied_amps <= 7.0 
+        assert coordinator._charger_state.applied_amps >= 6.0 
         
         # -----------------------------------------------------------------
         # PHASE 4: UNPLUG (07:00)
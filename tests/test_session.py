@@ -1,6 +1,6 @@
 
 from unittest.mock import MagicMock
-from datetime import datetime
+from datetime import datetime, timedelta
 import pytest
 
 # Use dynamic loading fixture
@@ -61,3 +61,171 @@ def test_persistence(pkg_loader):
     manager2.load_from_dict(exported)
     assert manager2.overload_prevention_minutes == 0.0  # Starts fresh
     assert len(manager2.action_log) == 1
+
+
+def test_action_log_prunes_old_entries(pkg_loader):
+    session_mod = pkg_loader("session_manager")
+    hass = MagicMock()
+    manager = session_mod.SessionManager(hass)
+
+    old_ts = datetime.now() - timedelta(hours=25)
+    stale = f"[{old_ts.strftime('%Y-%m-%d %H:%M:%S')}] Stale entry"
+    manager.load_from_dict({"action_log": [stale, "garbage"]})
+    assert manager.action_log == (stale,)
+
+    manager.add_log("Fresh entry")
+    assert len(manager.action_log) == 1
+    assert manager.action_log[0].endswith("Fresh entry")
+
+    # Round-trips through persistence in the same string format
+    manager2 = session_mod.SessionManager(hass)
+    manager2.load_from_dict(manager.to_dict())
+    assert manager2.action_log == manager.action_log
+    assert manager2.action_log is manager2.action_log  # cached until the log changes
+
+
+def test_session_log_is_capped(pkg_loader):
+    session_mod = pkg_loader("session_manager")
+    manager = session_mod.SessionManager(MagicMock())
+    manager.start_session(50.0)
+    manager.record_data_point({"car_soc": 50.0, "price_data": {}}, {}, 0, "idle")
+
+    for i in range(session_mod.SESSION_LOG_MAX_ENTRIES + 10):
+        manager.add_log(f"Entry {i}")
+
+    report = manager.stop_session({}, "SEK")
+    assert isinstance(report["session_log"], list)
+    assert len(report["session_log"]) == session_mod.SESSION_LOG_MAX_ENTRIES
+    assert report["session_log"][-1].endswith("Unplugged. Session ended.")
+
+
+def test_record_data_point_reuses_adjusted_prices(pkg_loader):
+    session_mod = pkg_loader("session_manager")
+    const = pkg_loader("const")
+
+    manager = session_mod.SessionManager(MagicMock())
+    manager.start_session(50.0)
+
+    today = [1.0] * 24
+    data = {"car_soc": 55.0, "price_data": {"today": today}}
+    user_settings = {const.ENTITY_PRICE_EXTRA_FEE: 0.5, const.ENTITY_PRICE_VAT: 25.0}
+
+    manager.record_data_point(data, user_settings, 16.0, "charging")
+    adjusted = manager._adjusted_price_cache[3]
+    manager.record_data_point(data, user_settings, 16.0, "charging")
+
+    assert manager._adjusted_price_cache[3] is adjusted
+    assert manager.current_session["history"][-1]["price"] == pytest.approx(1.875)
+
+    # A fee change recomputes the series
+    user_settings[const.ENTITY_PRICE_EXTRA_FEE] = 0.0
+    manager.record_data_point(data, user_settings, 16.0, "charging")
+    assert manager.current_session["history"][-1]["price"] == pytest.approx(1.25)
+
+
+def test_session_totals_from_history(pkg_loader, monkeypatch):
+    session_mod = pkg_loader("session_manager")
+
+    manager = session_mod.SessionManager(MagicMock())
+    manager.start_session(50.0)
+    mono = [1000.0]
+    monkeypatch.setattr(session_mod, "monotonic", lambda: mono[0])
+
+    start = datetime(2026, 1, 1, 0, 0)
+    points = (
+        (50.0, 16, "charging", 1.0),
+        (55.0, 16, "charging", 2.0),
+        (60.0, 0, "paused", 2.0),
+        (60.0, 0, "paused", 2.0),
+    )
+    for i, (soc, amps, state, price) in enumerate(points):
+        data = {"car_soc": soc, "price_data": {"today": [price] * 24}}
+        manager.record_data_point(data, {}, amps, state, start + timedelta(minutes=30 * i))
+        mono[0] += 30 * 60
+
+    totals = manager.calculate_session_totals("SEK")
+
+    # 16A on 3x230V = 11.04 kW for two half-hour intervals
+    assert totals["added_kwh"] == pytest.approx(11.04)
+    assert totals["total_cost"] == pytest.approx(5.52 * 1.0 + 5.52 * 2.0)
+    assert totals["end_soc"] == 60
+    assert len(totals["graph_data"]) == 4
+
+
+def test_session_totals_accumulate_while_recording(pkg_loader, monkeypatch):
+    session_mod = pkg_loader("session_manager")
+
+    clock = iter(datetime(2026, 1, 1, 0, 0) + timedelta(minutes=30 * i) for i in range(10))
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(clock)
+
+    manager = session_mod.SessionManager(MagicMock())
+    manager.start_session(50.0)
+    monkeypatch.setattr(session_mod, "datetime", FakeDatetime)
+
+    data = {"car_soc": 50.0, "price_data": {"today": [1.0] * 24}}
+    for amps, state in ((16, "charging"), (16, "charging"), (0, "paused")):
+        now = FakeDatetime.now()
+        # Interval lengths come from the monotonic clock
+        monkeypatch.setattr(session_mod, "monotonic", lambda: now.timestamp())
+        manager.record_data_point(data, {}, amps, state, now)
+
+    totals = manager.calculate_session_totals("SEK")
+    assert totals["added_kwh"] == pytest.approx(11.04)
+    # The report graph still gets plain point dicts
+    assert totals["graph_data"][0] == {
+        "time": "2026-01-01T00:00:00",
+        "soc": 50.0,
+        "amps": 16.0,
+        "charging": 1,
+        "price": 1.0,
+        "soc_sensor_refresh": False,
+    }
+
+
+def test_unchanged_data_points_are_skipped(pkg_loader, monkeypatch):
+    session_mod = pkg_loader("session_manager")
+
+    manager = session_mod.SessionManager(MagicMock())
+    manager.start_session(50.0)
+    mono = [1000.0]
+    monkeypatch.setattr(session_mod, "monotonic", lambda: mono[0])
+
+    data = {"car_soc": 50.0, "price_data": {"today": [1.0] * 24}}
+    for _ in range(3):
+        manager.record_data_point(data, {}, 0, "paused")
+        mono[0] += 30
+    assert len(manager.current_session["history"]) == 1
+
+    # A periodic point is still kept while idle
+    mono[0] += session_mod.HISTORY_RESAMPLE_SECONDS
+    manager.record_data_point(data, {}, 0, "paused")
+    assert len(manager.current_session["history"]) == 2
+
+    manager.record_data_point({**data, "car_soc": 51.0}, {}, 0, "paused")
+    assert len(manager.current_session["history"]) == 3
+
+
+def test_stop_session_counts_skipped_charging_ticks(pkg_loader, monkeypatch):
+    session_mod = pkg_loader("session_manager")
+
+    manager = session_mod.SessionManager(MagicMock())
+    manager.start_session(50.0)
+    mono = [1000.0]
+    monkeypatch.setattr(session_mod, "monotonic", lambda: mono[0])
+
+    data = {"car_soc": 50.0, "price_data": {"today": [1.0] * 24}}
+    for _ in range(10):
+        manager.record_data_point(data, {}, 16, "charging")
+        mono[0] += 60
+    # Constant amps: only the first tick became a point
+    assert len(manager.current_session["history"]) == 1
+
+    report = manager.stop_session({}, "SEK")
+
+    # 16A on 3x230V = 11.04 kW for the 10 minutes since that point
+    assert report["added_kwh"] == pytest.approx(11.04 / 6, abs=0.01)
+    assert report["total_cost"] == pytest.approx(11.04 / 6, abs=0.01)
@@ -1,33 +1,18 @@
 """Tests for smart refresh and learning timing functionality."""
-import pytest
 from datetime import datetime, time, timedelta
-from unittest.mock import Mock, AsyncMock, patch
-
-
-@pytest.fixture
-def mock_coordinator():
-    """Create a mock coordinator with necessary attributes."""
-    from custom_components.ev_optimizer.const import (
-        LEARNING_CHARGER_LOSS,
-        LEARNING_CONFIDENCE,
-        LEARNING_SESSIONS,
-        LEARNING_LOCKED,
-        LEARNING_LAST_REFRESH,
-    )
-    
-    coordinator = Mock()
-    coordinator.session_manager = Mock()
-    coordinator.learning_state = {
-        LEARNING_CHARGER_LOSS: 5.0,
-        LEARNING_CONFIDENCE: 3,
-        LEARNING_SESSIONS: 2,
-        LEARNING_LOCKED: False,
-        LEARNING_LAST_REFRESH: None,
-    }
-    coordinator._virtual_soc = 60.0
-    coordinator._soc_before_refresh = None
-    
-    return coordinator
+from unittest.mock import AsyncMock, patch
+
+from custom_components.ev_optimizer.const import (
+    LEARNING_LAST_REFRESH,
+    REFRESH_AT_TARGET,
+    REFRESH_NEVER,
+    REFRESH_1_HOUR,
+)
+
+# Evening of the session used by the timing tests below
+_BASE = datetime(2024, 1, 15)
+_T_22_00 = _BASE.replace(hour=22)
+_T_22_30 = _BASE.replace(hour=22, minute=30)
 
 
 def test_should_trigger_smart_refresh_returns_tuple():
@@ -59,9 +44,9 @@ def test_smart_refresh_not_triggered_without_session():
 
 def test_smart_refresh_triggered_30min_before_end():
     """Test that refresh is triggered 30 minutes before session end."""
-    now = datetime(2024, 1, 15, 22, 0)  # 10 PM
-    session_start = datetime(2024, 1, 15, 20, 0)  # 8 PM
-    planned_end = datetime(2024, 1, 15, 22, 30)  # 10:30 PM
+    now = _T_22_00  # 10 PM
+    session_start = _BASE.replace(hour=20)  # 8 PM
+    planned_end = _T_22_30  # 10:30 PM
     
     time_to_end_minutes = (planned_end - now).total_seconds() / 60
     session_duration_minutes = (planned_end - session_start).total_seconds() / 60
@@ -80,8 +65,8 @@ def test_smart_refresh_triggered_30min_before_end():
 
 def test_smart_refresh_not_triggered_too_early():
     """Test that refresh is not triggered more than 35 minutes before end."""
-    now = datetime(2024, 1, 15, 21, 0)  # 9 PM
-    planned_end = datetime(2024, 1, 15, 22, 30)  # 10:30 PM
+    now = _BASE.replace(hour=21)  # 9 PM
+    planned_end = _T_22_30  # 10:30 PM
     
     time_to_end_minutes = (planned_end - now).total_seconds() / 60
     
@@ -96,8 +81,8 @@ def test_smart_refresh_not_triggered_too_early():
 
 def test_smart_refresh_not_triggered_for_short_sessions():
     """Test that refresh is not triggered for sessions shorter than 60 minutes."""
-    session_start = datetime(2024, 1, 15, 22, 0)
-    planned_end = datetime(2024, 1, 15, 22, 45)  # Only 45 minutes
+    session_start = _T_22_00
+    planned_end = _BASE.replace(hour=22, minute=45)  # Only 45 minutes
     
     session_duration_minutes = (planned_end - session_start).total_seconds() / 60
     
@@ -215,8 +200,8 @@ def test_locked_learning_still_refreshes_30min_before():
     sessions = 10
     locked = True
     
-    now = datetime(2024, 1, 15, 22, 0)
-    planned_end = datetime(2024, 1, 15, 22, 30)
+    now = _T_22_00
+    planned_end = _T_22_30
     time_to_end_minutes = (planned_end - now).total_seconds() / 60
     
     # Even when locked, should refresh 30min before
@@ -335,12 +320,6 @@ def test_refresh_wait_time_30_seconds():
 
 def test_refresh_only_with_smart_mode():
     """Test that learning refresh only happens in REFRESH_AT_TARGET mode."""
-    from custom_components.ev_optimizer.const import (
-        REFRESH_AT_TARGET,
-        REFRESH_NEVER,
-        REFRESH_1_HOUR,
-    )
-    
     # Smart mode - learning enabled
     mode_smart = REFRESH_AT_TARGET
     assert mode_smart == "at_target"
@@ -376,10 +355,8 @@ def test_learning_history_limited_to_10_entries():
 
 def test_last_refresh_time_recorded():
     """Test that last refresh time is recorded for rate limiting."""
-    from custom_components.ev_optimizer.const import LEARNING_LAST_REFRESH
-    
     learning_state = {}
-    refresh_time = datetime(2024, 1, 15, 22, 0)
+    refresh_time = _T_22_00
     
     # Record refresh time
     learning_state[LEARNING_LAST_REFRESH] = refresh_time.isoformat()
@@ -389,8 +366,8 @@ def test_last_refresh_time_recorded():
 
 def test_refresh_rate_limiting_30_minutes():
     """Test that refreshes are rate-limited to once per 30 minutes."""
-    last_refresh = datetime(2024, 1, 15, 21, 45)
-    now = datetime(2024, 1, 15, 22, 0)
+    last_refresh = _BASE.replace(hour=21, minute=45)
+    now = _T_22_00
     
     minutes_since_last = (now - last_refresh).total_seconds() / 60
     
@@ -403,8 +380,8 @@ def test_refresh_rate_limiting_30_minutes():
 
 def test_refresh_allowed_after_30_minutes():
     """Test that refresh is allowed after 30 minutes."""
-    last_refresh = datetime(2024, 1, 15, 21, 25)
-    now = datetime(2024, 1, 15, 22, 0)
+    last_refresh = _BASE.replace(hour=21, minute=25)
+    now = _T_22_00
     
     minutes_since_last = (now - last_refresh).total_seconds() / 60
     
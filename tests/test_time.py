@@ -0,0 +1,25 @@
+from datetime import time
+from types import SimpleNamespace
+
+
+def _departure_entity(time_mod, data):
+    return time_mod.EVDepartureTime(SimpleNamespace(data=data))
+
+
+def test_departure_time_parses_stored_strings(pkg_loader):
+    time_mod = pkg_loader("time")
+    const = pkg_loader("const")
+
+    for stored in ("07:30", "07:30:00"):
+        entity = _departure_entity(time_mod, {const.ENTITY_DEPARTURE_TIME: stored})
+        assert entity.native_value == time(7, 30), stored
+
+
+def test_departure_time_falls_back_to_default(pkg_loader):
+    time_mod = pkg_loader("time")
+    const = pkg_loader("const")
+
+    for stored in (None, "", "0730", "later"):
+        entity = _departure_entity(time_mod, {const.ENTITY_DEPARTURE_TIME: stored})
+        assert entity.native_value == time(7, 0), stored
+    assert _departure_entity(time_mod, None).native_value == time(7, 0)